@@ -120,8 +120,13 @@ def extract_breakpoints(css_text):
     return sorted(breakpoints)
 
 
-def extract_design_tokens_from_css(css_text):
-    """Parse CSS text and extract structured design tokens."""
+def extract_design_tokens_from_css(css_text, sheet=None):
+    """Parse CSS text and extract structured design tokens.
+
+    sheet may be a cssutils stylesheet already parsed from css_text, to skip
+    parsing it again; custom properties and breakpoints still come from the
+    raw text.
+    """
     colors = defaultdict(list)
     typography = {}
     spacing_values = set()
@@ -129,7 +134,8 @@ def extract_design_tokens_from_css(css_text):
     components = []
 
     # Parse with cssutils for structured access
-    sheet = cssutils.parseString(css_text)
+    if sheet is None:
+        sheet = cssutils.parseString(css_text)
 
     for rule in sheet:
         if rule.type != rule.STYLE_RULE:
@@ -2,25 +2,183 @@
 """Compare original and clone screenshots, generating a visual diff report."""
 
 import argparse
+import base64
+import filecmp
+import html
+import importlib.util
+import io
 import os
+import shutil
 import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 try:
-    from PIL import Image, ImageChops, ImageDraw
+    from PIL import Image, ImageChops, ImageDraw, features
 except ImportError:
     print("Error: Pillow is required. Install with: pip install Pillow")
     sys.exit(1)
 
-# Optional dependencies for SSIM scoring
-_HAS_SSIM = False
+# Optional dependency for vectorized pixel comparison
+_HAS_NUMPY = False
 try:
     import numpy as np
-    from skimage.metrics import structural_similarity as ssim
-    _HAS_SSIM = True
+    _HAS_NUMPY = True
 except ImportError:
     pass
 
+# Optional JIT for the pixel loops below (needs NumPy as well). Off by
+# default: this script is loaded from a file path, so Numba cannot cache the
+# compiled kernels and every process, pool workers included, pays about a
+# second of compilation per kernel. That only pays off for very large batches.
+# Opt in with --numba or VISUAL_DIFF_NUMBA=1; see enable_numba().
+_HAS_NUMBA = False
+prange = range
+
+# Optional dependencies for SSIM scoring. scikit-image pulls in SciPy and
+# takes hundreds of milliseconds to import, so only check that it is
+# installed here; _ssim imports it the first time a score is needed.
+_HAS_SSIM = _HAS_NUMPY and importlib.util.find_spec("skimage") is not None
+
+# Per-channel difference at or below which two pixels count as matching
+PIXEL_TOLERANCE = 10
+
+# Summed RGB difference above which a pixel is highlighted in the diff image
+DIFF_HIGHLIGHT_THRESHOLD = 30
+
+# Display names for the --metric choices and per-region metrics
+METRIC_LABELS = {"ssim": "SSIM", "pixel": "Pixel", "mse": "MSE"}
+
+# Side length of the thumbnails compared by the MSE metric
+MSE_SAMPLE_SIZE = 16
+
+# Bounding box for the inline previews in the report's summary table
+THUMBNAIL_SIZE = (200, 150)
+
+# Highlight alpha for each summed difference value (0-255) in the diff band
+_HIGHLIGHT_ALPHA_LUT = [
+    min(255, v * 2) if v > DIFF_HIGHLIGHT_THRESHOLD else 0 for v in range(256)
+]
+
+
+def _count_matching(pixels1, pixels2, tolerance):
+    """Count pixels whose RGB channels all differ by at most tolerance.
+
+    Takes (N, 3) uint8 arrays. Only called on full images once
+    enable_numba() has compiled it.
+    """
+    count = 0
+    for i in prange(pixels1.shape[0]):
+        # Widen before subtracting; uint8 arithmetic would wrap around
+        if (abs(np.int16(pixels1[i, 0]) - np.int16(pixels2[i, 0])) <= tolerance
+                and abs(np.int16(pixels1[i, 1]) - np.int16(pixels2[i, 1])) <= tolerance
+                and abs(np.int16(pixels1[i, 2]) - np.int16(pixels2[i, 2])) <= tolerance):
+            count += 1
+    return count
+
+
+def _match_and_alpha(pixels1, pixels2, tolerance, threshold, alpha):
+    """Count matching pixels and fill in the diff highlight alpha in one pass.
+
+    Like _count_matching, but also writes the per-pixel highlight alpha
+    (see _HIGHLIGHT_ALPHA_LUT) into alpha, a length-N uint8 array. Pass an
+    empty alpha to skip that part. compare() only uses it after
+    enable_numba(); otherwise its vectorised NumPy mask does the same work.
+    """
+    write_alpha = alpha.shape[0] > 0
+    count = 0
+    for i in prange(pixels1.shape[0]):
+        d0 = abs(np.int16(pixels1[i, 0]) - np.int16(pixels2[i, 0]))
+        d1 = abs(np.int16(pixels1[i, 1]) - np.int16(pixels2[i, 1]))
+        d2 = abs(np.int16(pixels1[i, 2]) - np.int16(pixels2[i, 2]))
+        if d0 <= tolerance and d1 <= tolerance and d2 <= tolerance:
+            count += 1
+        if write_alpha:
+            total = d0 + d1 + d2
+            alpha[i] = min(255, total * 2) if total > threshold else 0
+    return count
+
+
+def _heatmap_pixels(diff_map, heatmap):
+    """Write the SSIM heatmap colours for an (H, W, C) diff_map into heatmap.
+
+    Averages the channels, clamps and encodes all three output channels in
+    one loop over the pixels. Only used after enable_numba(); the default
+    heatmap path is plain NumPy.
+    """
+    height, width, channels = diff_map.shape
+    for y in prange(height):
+        for x in range(width):
+            total = 0.0
+            for c in range(channels):
+                total += diff_map[y, x, c]
+            sim = min(max(total / channels, 0.0), 1.0)
+            heatmap[y, x, 0] = np.uint8((1.0 - sim) * 255)
+            heatmap[y, x, 1] = np.uint8(min(sim, 1.0 - sim) * 2 * 255)
+            heatmap[y, x, 2] = np.uint8(sim * 255)
+
+
+def enable_numba():
+    """Import Numba and switch the pixel kernels to JIT-compiled versions.
+
+    Kernels compile on their first call. Returns whether Numba is in use,
+    which needs both NumPy and Numba installed.
+    """
+    global _HAS_NUMBA, prange, _count_matching, _match_and_alpha, _heatmap_pixels
+    if _HAS_NUMBA or not _HAS_NUMPY:
+        return _HAS_NUMBA
+    try:
+        import numba
+    except ImportError:
+        return False
+    # The kernels look prange up as a global when they are compiled
+    prange = numba.prange
+    jit = numba.njit(parallel=True)
+    _count_matching = jit(_count_matching)
+    _match_and_alpha = jit(_match_and_alpha)
+    _heatmap_pixels = jit(_heatmap_pixels)
+    _HAS_NUMBA = True
+    return True
+
+
+# Spawned pool workers re-import this script; the variable carries the opt-in
+if os.environ.get("VISUAL_DIFF_NUMBA") == "1":
+    enable_numba()
+
+
+def _to_rgb(img):
+    """Return img in RGB mode, without copying it if it already is."""
+    return img if img.mode == "RGB" else img.convert("RGB")
+
+
+def _pixel_similarity_arrays(arr1, arr2):
+    """Pixel similarity percentage for two same-shape (H, W, 3) uint8 arrays."""
+    total_pixels = arr1.shape[0] * arr1.shape[1]
+    if total_pixels == 0:
+        return 0.0
+
+    # Unchanged regions are common; a plain equality pass over the bytes is
+    # several times cheaper than the tolerance compare below
+    if np.array_equal(arr1, arr2):
+        return 100.0
+
+    if _HAS_NUMBA:
+        # Fused compare-and-count with no int16 or boolean temporaries
+        matching = _count_matching(
+            arr1.reshape(-1, 3), arr2.reshape(-1, 3), PIXEL_TOLERANCE
+        )
+        return (matching / total_pixels) * 100
+
+    # A pixel matches if its largest channel difference is within tolerance.
+    # max - min is |a - b| without wrapping, so everything stays uint8, and
+    # the per-channel maximum over strided views avoids a slow axis reduction.
+    diff = np.maximum(arr1, arr2)
+    diff -= np.minimum(arr1, arr2)
+    worst = np.maximum(np.maximum(diff[..., 0], diff[..., 1]), diff[..., 2])
+    matching = int(np.count_nonzero(worst <= PIXEL_TOLERANCE))
+    return (matching / total_pixels) * 100
+
 
 def calculate_pixel_similarity(img1, img2):
     """Calculate pixel-level similarity percentage between two images."""
@@ -29,21 +187,22 @@ def calculate_pixel_similarity(img1, img2):
         img2 = img2.resize(img1.size, Image.LANCZOS)
 
     # Convert to RGB for comparison
-    img1_rgb = img1.convert("RGB")
-    img2_rgb = img2.convert("RGB")
-
-    pixels1 = list(img1_rgb.getdata())
-    pixels2 = list(img2_rgb.getdata())
+    img1_rgb = _to_rgb(img1)
+    img2_rgb = _to_rgb(img2)
 
-    total_pixels = len(pixels1)
+    width, height = img1_rgb.size
+    total_pixels = width * height
     if total_pixels == 0:
         return 0.0
 
-    matching = 0
-    for p1, p2 in zip(pixels1, pixels2):
-        # Consider pixels "matching" if they're within a small tolerance
-        if all(abs(a - b) <= 10 for a, b in zip(p1, p2)):
-            matching += 1
+    if _HAS_NUMPY:
+        return _pixel_similarity_arrays(np.asarray(img1_rgb), np.asarray(img2_rgb))
+
+    # Without NumPy, stay in Pillow's C code: per-channel |a - b|, the
+    # largest channel per pixel, then count pixels at or under tolerance
+    red, green, blue = ImageChops.difference(img1_rgb, img2_rgb).split()
+    worst = ImageChops.lighter(ImageChops.lighter(red, green), blue)
+    matching = sum(worst.histogram()[:PIXEL_TOLERANCE + 1])
 
     return (matching / total_pixels) * 100
 
@@ -52,11 +211,84 @@ def calculate_pixel_similarity(img1, img2):
 calculate_similarity = calculate_pixel_similarity
 
 
-def calculate_ssim(img1, img2):
+def calculate_sampled_pixel_similarity(img1, img2, sample_size, seed=0):
+    """Estimate pixel similarity from sample_size randomly chosen pixels.
+
+    The same pixels are drawn for a given image size and seed, so reruns give
+    the same score. With 100k samples the estimate is within about 0.3
+    percentage points of the full score. Falls back to the full comparison
+    when the image has no more pixels than the sample or NumPy is missing.
+    """
+    if img1.size != img2.size:
+        img2 = img2.resize(img1.size, Image.LANCZOS)
+
+    width, height = img1.size
+    total_pixels = width * height
+    if not _HAS_NUMPY or total_pixels <= sample_size:
+        return calculate_pixel_similarity(img1, img2)
+
+    # Sorted indices gather in memory order
+    indices = np.random.default_rng(seed).choice(
+        total_pixels, sample_size, replace=False, shuffle=False
+    )
+    indices.sort()
+    # Gathered pixels as (N, 1, 3) so the full-image kernels apply unchanged
+    pixels1 = np.asarray(_to_rgb(img1)).reshape(-1, 3)[indices][:, np.newaxis]
+    pixels2 = np.asarray(_to_rgb(img2)).reshape(-1, 3)[indices][:, np.newaxis]
+    return _pixel_similarity_arrays(pixels1, pixels2)
+
+
+def calculate_mse_similarity(img1, img2):
+    """Score two images 0-100 from the MSE of 16x16 downsampled copies.
+
+    A cheap stand-in for the pixel metric: the cost is dominated by one
+    resample per image, and the comparison itself touches 768 values.
+    """
+    size = (MSE_SAMPLE_SIZE, MSE_SAMPLE_SIZE)
+    small1 = _to_rgb(img1).resize(size, Image.BILINEAR, reducing_gap=2.0)
+    small2 = _to_rgb(img2).resize(size, Image.BILINEAR, reducing_gap=2.0)
+
+    if _HAS_NUMPY:
+        diff = np.asarray(small1, dtype=np.float32) - np.asarray(small2, dtype=np.float32)
+        mse = float((diff * diff).mean())
+    else:
+        buf1 = small1.tobytes()
+        buf2 = small2.tobytes()
+        mse = sum((a - b) ** 2 for a, b in zip(buf1, buf2)) / len(buf1)
+
+    return 100.0 * (1.0 - min(mse / 10000.0, 1.0))
+
+
+def _reduce_for_ssim(img, factor):
+    """Box-downsample img by an integer factor for SSIM.
+
+    The factor is capped so both sides stay at least 7 px, the size of
+    scikit-image's default SSIM window.
+    """
+    factor = min(factor, min(img.size) // 7)
+    return img.reduce(factor) if factor > 1 else img
+
+
+def _ssim_array(img, mode):
+    """Array that SSIM runs on: the luma plane, or the (H, W, 3) RGB pixels."""
+    return np.asarray(img.convert("L") if mode == "luma" else _to_rgb(img))
+
+
+def _ssim(arr1, arr2, **kwargs):
+    """scikit-image SSIM over 2-D luma or 3-D RGB arrays."""
+    from skimage.metrics import structural_similarity
+    return structural_similarity(arr1, arr2, channel_axis=2 if arr1.ndim == 3 else None, **kwargs)
+
+
+def calculate_ssim(img1, img2, downscale=1, mode="rgb"):
     """Calculate SSIM between two PIL images. Returns (score, diff_map).
 
     The score is a float from 0.0 to 1.0 (1.0 = identical).
-    The diff_map is a numpy array with per-pixel SSIM values (same shape as input).
+    The diff_map is a numpy array with per-pixel SSIM values, at the input
+    size divided by downscale. SSIM is a windowed, blurred metric, so a 2x
+    box downsample keeps the score close while doing a quarter of the work.
+    mode 'luma' compares Pillow's L (luminance) plane only, one Gaussian
+    filter pass per statistic instead of three; 'rgb' averages all channels.
     """
     if not _HAS_SSIM:
         raise RuntimeError(
@@ -68,10 +300,11 @@ def calculate_ssim(img1, img2):
     if img1.size != img2.size:
         img2 = img2.resize(img1.size, Image.LANCZOS)
 
-    arr1 = np.array(img1.convert("RGB"))
-    arr2 = np.array(img2.convert("RGB"))
+    if downscale > 1:
+        img1 = _reduce_for_ssim(img1, downscale)
+        img2 = _reduce_for_ssim(img2, downscale)
 
-    score, diff_map = ssim(arr1, arr2, full=True, channel_axis=2)
+    score, diff_map = _ssim(_ssim_array(img1, mode), _ssim_array(img2, mode), full=True)
     return score, diff_map
 
 
@@ -85,6 +318,14 @@ def generate_ssim_heatmap(diff_map):
         PIL.Image in RGB mode showing the heatmap.
     """
     # diff_map values: 1.0 = identical, 0.0 = completely different
+    if _HAS_NUMBA:
+        # Mean, clamp and all three channels in a single compiled pass
+        if diff_map.ndim == 2:
+            diff_map = diff_map[:, :, np.newaxis]
+        heatmap = np.empty(diff_map.shape[:2] + (3,), dtype=np.uint8)
+        _heatmap_pixels(diff_map, heatmap)
+        return Image.fromarray(heatmap, mode="RGB")
+
     # Average across color channels if multi-channel
     if diff_map.ndim == 3:
         similarity = np.mean(diff_map, axis=2)
@@ -108,14 +349,54 @@ def generate_ssim_heatmap(diff_map):
     return Image.fromarray(heatmap, mode="RGB")
 
 
-def calculate_region_scores(img1, img2, num_regions, metric="ssim"):
+def _region_label(index, num_regions):
+    """Return the display label for the zero-based region index."""
+    if index == 0:
+        return f"Region {index + 1} (top)"
+    if index == num_regions - 1:
+        return f"Region {index + 1} (bottom)"
+    return f"Region {index + 1}"
+
+
+def _region_bands(height, num_regions):
+    """(index, top, bottom) row ranges splitting height into num_regions bands."""
+    band_height = height // num_regions
+    for i in range(num_regions):
+        # Last region takes any remaining pixels
+        bottom = height if i == num_regions - 1 else (i + 1) * band_height
+        yield i, i * band_height, bottom
+
+
+def _region_scores_arrays(arr1, arr2, num_regions, use_ssim=False):
+    """Per-band scores for two same-shape arrays, as for calculate_region_scores().
+
+    With use_ssim the arrays are _ssim_array() planes and bands are scored by
+    SSIM; otherwise they are (H, W, 3) uint8 RGB and scored by pixel similarity.
+    Bands of a row-major array are zero-copy slices, so nothing is re-converted.
+    """
+    metric = "ssim" if use_ssim else "pixel"
+    score_band = _ssim if use_ssim else _pixel_similarity_arrays
+    return [
+        {
+            "label": _region_label(i, num_regions),
+            "score": score_band(arr1[top:bottom], arr2[top:bottom]),
+            "metric": metric,
+        }
+        for i, top, bottom in _region_bands(arr1.shape[0], num_regions)
+    ]
+
+
+def calculate_region_scores(img1, img2, num_regions, metric="ssim", ssim_downscale=1,
+                            ssim_mode="rgb"):
     """Divide images into horizontal bands and calculate similarity per region.
 
     Args:
         img1: Original PIL Image.
         img2: Clone PIL Image.
         num_regions: Number of horizontal bands to divide into.
-        metric: 'ssim' or 'pixel'.
+        metric: 'ssim', 'pixel' or 'mse'.
+        ssim_downscale: Integer factor to box-downsample by before SSIM.
+        ssim_mode: 'luma' or 'rgb', as for calculate_ssim().
 
     Returns:
         List of dicts with keys: label, score, metric.
@@ -124,29 +405,40 @@ def calculate_region_scores(img1, img2, num_regions, metric="ssim"):
     if img1.size != img2.size:
         img2 = img2.resize(img1.size, Image.LANCZOS)
 
+    use_ssim = metric == "ssim" and _HAS_SSIM
+    if use_ssim:
+        # Every band has to fit the 7 px SSIM window after downsampling; bands
+        # too short for it even at full resolution are scored per pixel instead
+        band_height = img1.height // num_regions
+        ssim_downscale = min(ssim_downscale, band_height // 7)
+        use_ssim = min(band_height, img1.width) >= 7
+    if use_ssim and ssim_downscale > 1:
+        img1 = _reduce_for_ssim(img1, ssim_downscale)
+        img2 = _reduce_for_ssim(img2, ssim_downscale)
+
+    # Convert once up front instead of cropping and converting each band for
+    # the pixel/SSIM metrics. MSE resamples each band and still works on crops.
+    if use_ssim:
+        return _region_scores_arrays(
+            _ssim_array(img1, ssim_mode), _ssim_array(img2, ssim_mode), num_regions, True
+        )
+    if _HAS_NUMPY and metric != "mse":
+        return _region_scores_arrays(
+            np.asarray(_to_rgb(img1)), np.asarray(_to_rgb(img2)), num_regions
+        )
+
     width, height = img1.size
-    band_height = height // num_regions
     regions = []
-
-    for i in range(num_regions):
-        top = i * band_height
-        # Last region takes any remaining pixels
-        bottom = height if i == num_regions - 1 else (i + 1) * band_height
+    for i, top, bottom in _region_bands(height, num_regions):
+        label = _region_label(i, num_regions)
 
         crop_box = (0, top, width, bottom)
         region1 = img1.crop(crop_box)
         region2 = img2.crop(crop_box)
 
-        if i == 0:
-            label = f"Region {i + 1} (top)"
-        elif i == num_regions - 1:
-            label = f"Region {i + 1} (bottom)"
-        else:
-            label = f"Region {i + 1}"
-
-        if metric == "ssim" and _HAS_SSIM:
-            score, _ = calculate_ssim(region1, region2)
-            regions.append({"label": label, "score": score, "metric": "ssim"})
+        if metric == "mse":
+            score = calculate_mse_similarity(region1, region2)
+            regions.append({"label": label, "score": score, "metric": "mse"})
         else:
             score = calculate_pixel_similarity(region1, region2)
             regions.append({"label": label, "score": score, "metric": "pixel"})
@@ -154,6 +446,94 @@ def calculate_region_scores(img1, img2, num_regions, metric="ssim"):
     return regions
 
 
+# Web fonts loaded, then two animation frames so layout has settled
+_FONTS_READY_JS = "() => !document.fonts || document.fonts.status === 'loaded'"
+_LAYOUT_SETTLE_JS = (
+    "() => new Promise(r => requestAnimationFrame(() => requestAnimationFrame(r)))"
+)
+FONT_WAIT_TIMEOUT_MS = 5000
+
+
+def _wait_for_render(page):
+    """Wait until fonts are loaded and layout has settled, bounded in time.
+
+    A page whose fonts never load is screenshotted anyway after
+    FONT_WAIT_TIMEOUT_MS rather than failing the run.
+    """
+    from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+    try:
+        page.wait_for_function(_FONTS_READY_JS, timeout=FONT_WAIT_TIMEOUT_MS)
+    except PlaywrightTimeoutError:
+        pass
+    page.evaluate(_LAYOUT_SETTLE_JS)
+
+
+def _screenshot_breakpoints(browser, html_path, breakpoints, output_dir):
+    """Screenshot one HTML file at each width using a single resized page.
+
+    The page is loaded once; each breakpoint only resizes the viewport and
+    waits for fonts and layout. Cloned pages are local static files, so the
+    'load' event is enough and the 500 ms quiet period of 'networkidle' is
+    not paid.
+    """
+    html_path = Path(html_path).resolve()
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    screenshots = {}
+    if not breakpoints:
+        return screenshots
+    stem = html_path.stem
+    page = browser.new_page(viewport={"width": breakpoints[0], "height": 900})
+    try:
+        page.goto(f"file://{html_path}", wait_until="load")
+        for width in breakpoints:
+            page.set_viewport_size({"width": width, "height": 900})
+            _wait_for_render(page)
+            screenshot_path = output_dir / f"{stem}-{width}.png"
+            page.screenshot(path=str(screenshot_path), full_page=True)
+            screenshots[width] = screenshot_path
+    finally:
+        page.close()
+    return screenshots
+
+
+def render_pages_at_breakpoints(html_paths, breakpoints, output_dir):
+    """Render several HTML files at multiple viewport widths in one browser.
+
+    Args:
+        html_paths: Paths to the HTML files.
+        breakpoints: List of viewport widths (ints).
+        output_dir: Directory to save screenshots; each file gets a
+            subdirectory named after its stem.
+
+    Returns:
+        Dict mapping file stem -> {width: Path to screenshot file}, or an
+        empty dict if Playwright is not installed.
+    """
+    try:
+        from playwright.sync_api import sync_playwright
+    except ImportError:
+        print("Warning: Playwright is required for responsive testing. "
+              "Install with: pip install playwright && python -m playwright install chromium")
+        return {}
+
+    output_dir = Path(output_dir)
+    rendered = {}
+    with sync_playwright() as p:
+        browser = p.chromium.launch()
+        for html_path in html_paths:
+            stem = Path(html_path).stem
+            print(f"  Rendering {stem} at {len(breakpoints)} breakpoints...")
+            rendered[stem] = _screenshot_breakpoints(
+                browser, html_path, breakpoints, output_dir / stem
+            )
+        browser.close()
+
+    return rendered
+
+
 def render_html_at_breakpoints(html_path, breakpoints, output_dir):
     """Render an HTML file at multiple viewport widths using Playwright.
 
@@ -172,279 +552,728 @@ def render_html_at_breakpoints(html_path, breakpoints, output_dir):
               "Install with: pip install playwright && python -m playwright install chromium")
         return {}
 
-    html_path = Path(html_path).resolve()
-    output_dir = Path(output_dir)
-    output_dir.mkdir(parents=True, exist_ok=True)
-
-    screenshots = {}
-    file_url = f"file://{html_path}"
-    stem = html_path.stem
-
     with sync_playwright() as p:
         browser = p.chromium.launch()
-        for width in breakpoints:
-            page = browser.new_page(viewport={"width": width, "height": 900})
-            page.goto(file_url, wait_until="networkidle")
-            screenshot_path = output_dir / f"{stem}-{width}.png"
-            page.screenshot(path=str(screenshot_path), full_page=True)
-            screenshots[width] = screenshot_path
-            page.close()
+        screenshots = _screenshot_breakpoints(browser, html_path, breakpoints, output_dir)
         browser.close()
 
     return screenshots
 
 
+def _highlight_alpha(abs_diff):
+    """Build the L-mode highlight alpha from a per-channel absolute difference array."""
+    total_diff = abs_diff.sum(axis=2)
+    mask = total_diff > DIFF_HIGHLIGHT_THRESHOLD
+    alpha = np.where(mask, np.minimum(255, total_diff * 2), 0).astype(np.uint8)
+    return Image.fromarray(alpha, mode="L")
+
+
 def generate_diff_image(img1, img2):
     """Generate a diff image highlighting differences in red."""
     if img1.size != img2.size:
         img2 = img2.resize(img1.size, Image.LANCZOS)
 
-    img1_rgb = img1.convert("RGB")
-    img2_rgb = img2.convert("RGB")
+    img1_rgb = _to_rgb(img1)
+    img2_rgb = _to_rgb(img2)
 
     diff = ImageChops.difference(img1_rgb, img2_rgb)
 
-    # Create highlight image: red where pixels differ
-    width, height = img1.size
-    highlight = Image.new("RGBA", (width, height), (0, 0, 0, 0))
-    diff_pixels = list(diff.getdata())
-
-    highlight_data = []
-    for pixel in diff_pixels:
-        total_diff = sum(pixel)
-        if total_diff > 30:  # Threshold for "different"
-            alpha = min(255, total_diff * 2)
-            highlight_data.append((255, 0, 0, alpha))
-        else:
-            highlight_data.append((0, 0, 0, 0))
+    # Sum the channel differences in C; add() clips at 255, which is already
+    # past the point where the highlight alpha saturates
+    r, g, b = diff.split()
+    total_diff = ImageChops.add(ImageChops.add(r, g), b)
+    return _composite_highlight(img1_rgb, total_diff.point(_HIGHLIGHT_ALPHA_LUT))
 
-    highlight.putdata(highlight_data)
 
-    # Composite: original with red overlay for diffs
-    base = img1_rgb.convert("RGBA")
-    composite = Image.alpha_composite(base, highlight)
-    return composite.convert("RGB")
+def _composite_highlight(img_rgb, alpha):
+    """Overlay red onto img_rgb wherever the L-mode alpha band is non-zero."""
+    # Pasting a solid colour through the alpha as a mask blends in place on
+    # an RGB copy: the same pixels as an RGBA alpha_composite, without the
+    # red/zero bands, the RGBA base or the convert back to RGB
+    composite = img_rgb.copy()
+    composite.paste((255, 0, 0), None, alpha)
+    return composite
 
 
-def match_screenshots(original_dir, clone_dir):
-    """Match original screenshots to clone screenshots by filename."""
-    original_path = Path(original_dir)
-    clone_path = Path(clone_dir)
-
-    original_files = {}
-    for f in original_path.iterdir():
-        if f.suffix.lower() in (".png", ".jpg", ".jpeg", ".webp"):
-            original_files[f.stem] = f
-
-    clone_files = {}
-    for f in clone_path.iterdir():
-        if f.suffix.lower() in (".png", ".jpg", ".jpeg", ".webp"):
-            clone_files[f.stem] = f
-
-    pairs = []
-    matched_clones = set()
-
-    for name, orig_file in sorted(original_files.items()):
-        if name in clone_files:
-            pairs.append((orig_file, clone_files[name]))
-            matched_clones.add(name)
-        else:
-            pairs.append((orig_file, None))
+def compare(img1, img2, diff_below=100.0):
+    """Calculate pixel similarity and the diff image in a single pass.
 
-    for name, clone_file in sorted(clone_files.items()):
-        if name not in matched_clones:
-            pairs.append((None, clone_file))
+    Returns (similarity, diff_image). diff_image is only built when the
+    similarity is below diff_below; by default that means whenever any
+    pixel differs beyond PIXEL_TOLERANCE. Otherwise it is None.
+    """
+    if not _HAS_NUMPY:
+        similarity = calculate_pixel_similarity(img1, img2)
+        if similarity >= diff_below:
+            return similarity, None
+        return similarity, generate_diff_image(img1, img2)
 
-    return pairs
+    if img1.size != img2.size:
+        img2 = img2.resize(img1.size, Image.LANCZOS)
 
+    img1_rgb = _to_rgb(img1)
+    width, height = img1_rgb.size
+    total_pixels = width * height
+    if total_pixels == 0:
+        return 0.0, None
+
+    if _HAS_NUMBA:
+        # One compiled pass yields both the match count and the highlight
+        # alpha, without the full-size int16 difference array
+        alpha = np.empty(total_pixels if diff_below > 0 else 0, dtype=np.uint8)
+        matching = _match_and_alpha(
+            np.asarray(img1_rgb).reshape(-1, 3),
+            np.asarray(_to_rgb(img2)).reshape(-1, 3),
+            PIXEL_TOLERANCE,
+            DIFF_HIGHLIGHT_THRESHOLD,
+            alpha,
+        )
+        similarity = (matching / total_pixels) * 100
+        if similarity >= diff_below:
+            return similarity, None
+        alpha_band = Image.fromarray(alpha.reshape(height, width), mode="L")
+        return similarity, _composite_highlight(img1_rgb, alpha_band)
+
+    abs_diff = np.abs(
+        np.asarray(img1_rgb, dtype=np.int16)
+        - np.asarray(_to_rgb(img2), dtype=np.int16)
+    )
+    matching = int(np.count_nonzero((abs_diff <= PIXEL_TOLERANCE).all(axis=2)))
+    similarity = (matching / total_pixels) * 100
+    if similarity >= diff_below:
+        return similarity, None
 
-def generate_html_report(results, output_dir, metric="ssim", responsive_results=None):
-    """Generate an HTML report with side-by-side comparisons."""
-    html_parts = [
-        "<!DOCTYPE html>",
-        "<html lang='en'>",
-        "<head>",
-        "<meta charset='utf-8'>",
-        "<meta name='viewport' content='width=device-width, initial-scale=1'>",
-        "<title>Visual Diff Report</title>",
-        "<style>",
-        "body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif; ",
-        "  margin: 0; padding: 20px; background: #f5f5f5; color: #333; }",
-        "h1 { text-align: center; margin-bottom: 10px; }",
-        ".summary { text-align: center; margin-bottom: 30px; color: #666; }",
-        ".comparison { background: #fff; border-radius: 8px; padding: 20px; ",
-        "  margin-bottom: 20px; box-shadow: 0 1px 3px rgba(0,0,0,0.1); }",
-        ".comparison h2 { margin-top: 0; }",
-        ".status { display: inline-block; padding: 2px 10px; border-radius: 12px; ",
-        "  font-size: 13px; font-weight: bold; }",
-        ".pass { background: #d4edda; color: #155724; }",
-        ".fail { background: #f8d7da; color: #721c24; }",
-        ".missing { background: #fff3cd; color: #856404; }",
-        ".images { display: flex; gap: 10px; margin-top: 15px; flex-wrap: wrap; }",
-        ".images figure { flex: 1; min-width: 200px; margin: 0; text-align: center; }",
-        ".images img { max-width: 100%; height: auto; border: 1px solid #ddd; }",
-        ".images figcaption { font-size: 12px; color: #666; margin-top: 5px; }",
-        "table { width: 100%; border-collapse: collapse; margin: 20px 0; }",
-        "th, td { text-align: left; padding: 8px 12px; border-bottom: 1px solid #ddd; }",
-        "th { background: #f8f9fa; }",
-        ".region-table { margin-top: 15px; }",
-        ".region-table td.score { font-family: monospace; }",
-        ".responsive-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); ",
-        "  gap: 15px; margin-top: 15px; }",
-        ".responsive-grid figure { margin: 0; text-align: center; background: #f8f9fa; ",
-        "  border-radius: 4px; padding: 10px; }",
-        ".responsive-grid img { max-width: 100%; height: auto; border: 1px solid #ddd; }",
-        ".responsive-grid figcaption { font-size: 12px; color: #666; margin-top: 5px; }",
-        "h3 { margin-top: 20px; margin-bottom: 10px; color: #555; }",
-        "</style>",
-        "</head>",
-        "<body>",
-        "<h1>Visual Diff Report</h1>",
-    ]
+    return similarity, _composite_highlight(img1_rgb, _highlight_alpha(abs_diff))
 
-    # Summary table
-    total = len(results)
-    passed = sum(1 for r in results if r.get("status") == "pass")
-    failed = sum(1 for r in results if r.get("status") == "fail")
-    missing = sum(1 for r in results if r.get("status") == "missing")
 
-    metric_label = "SSIM" if metric == "ssim" else "Pixel"
-    html_parts.append(f"<p class='summary'>{total} pages compared: "
-                      f"{passed} passed, {failed} failed, {missing} missing "
-                      f"(primary metric: {metric_label})</p>")
+SCREENSHOT_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp")
 
-    # Summary table with both metrics
-    html_parts.append("<table>")
-    header_cols = "<tr><th>Page</th><th>Pixel Similarity</th>"
-    if any(r.get("ssim_score") is not None for r in results):
-        header_cols += "<th>SSIM Score</th>"
-    header_cols += "<th>Status</th></tr>"
-    html_parts.append(header_cols)
 
-    for r in results:
-        name = r["name"]
-        similarity = r.get("similarity", "N/A")
-        ssim_score = r.get("ssim_score")
-        status = r.get("status", "unknown")
+def _index_screenshots(directory):
+    """Map file stem -> Path for every screenshot directly inside directory."""
+    files = {}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            name = entry.name
+            dot = name.rfind(".")
+            # A name like ".png" has no suffix, matching Path.suffix
+            if dot > 0 and name[dot:].lower() in SCREENSHOT_EXTENSIONS:
+                files[name[:dot]] = Path(entry.path)
+    return files
 
-        if isinstance(similarity, float):
-            sim_str = f"{similarity:.1f}%"
-        else:
-            sim_str = str(similarity)
 
-        ssim_str = f"{ssim_score:.4f}" if ssim_score is not None else "N/A"
+def match_screenshots(original_dir, clone_dir):
+    """Match original screenshots to clone screenshots by filename."""
+    original_files = _index_screenshots(original_dir)
+    clone_files = _index_screenshots(clone_dir)
+
+    # Originals in name order (clone or None), then clone-only names
+    pairs = [(orig_file, clone_files.get(name))
+             for name, orig_file in sorted(original_files.items())]
+    pairs.extend((None, clone_files[name])
+                 for name in sorted(clone_files.keys() - original_files.keys()))
+    return pairs
 
-        status_class = status
-        row = f"<tr><td>{name}</td><td>{sim_str}</td>"
-        if any(r2.get("ssim_score") is not None for r2 in results):
-            row += f"<td>{ssim_str}</td>"
-        row += f"<td><span class='status {status_class}'>{status.upper()}</span></td></tr>"
-        html_parts.append(row)
 
-    html_parts.append("</table>")
+_REPORT_HEAD = "\n".join([
+    "<!DOCTYPE html>",
+    "<html lang='en'>",
+    "<head>",
+    "<meta charset='utf-8'>",
+    "<meta name='viewport' content='width=device-width, initial-scale=1'>",
+    "<title>Visual Diff Report</title>",
+    "<style>",
+    "body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif; ",
+    "  margin: 0; padding: 20px; background: #f5f5f5; color: #333; }",
+    "h1 { text-align: center; margin-bottom: 10px; }",
+    ".summary { text-align: center; margin-bottom: 30px; color: #666; }",
+    ".comparison { background: #fff; border-radius: 8px; padding: 20px; ",
+    "  margin-bottom: 20px; box-shadow: 0 1px 3px rgba(0,0,0,0.1); }",
+    ".comparison h2 { margin-top: 0; }",
+    ".status { display: inline-block; padding: 2px 10px; border-radius: 12px; ",
+    "  font-size: 13px; font-weight: bold; }",
+    ".pass { background: #d4edda; color: #155724; }",
+    ".fail { background: #f8d7da; color: #721c24; }",
+    ".missing { background: #fff3cd; color: #856404; }",
+    ".images { display: flex; gap: 10px; margin-top: 15px; flex-wrap: wrap; }",
+    ".images figure { flex: 1; min-width: 200px; margin: 0; text-align: center; }",
+    ".images img { max-width: 100%; height: auto; border: 1px solid #ddd; }",
+    "td img.thumb { width: 100px; height: auto; border: 1px solid #ddd; display: block; }",
+    "details > summary { cursor: pointer; color: #555; margin-top: 10px; }",
+    ".images figcaption { font-size: 12px; color: #666; margin-top: 5px; }",
+    "table { width: 100%; border-collapse: collapse; margin: 20px 0; }",
+    "th, td { text-align: left; padding: 8px 12px; border-bottom: 1px solid #ddd; }",
+    "th { background: #f8f9fa; }",
+    ".region-table { margin-top: 15px; }",
+    ".region-table td.score { font-family: monospace; }",
+    ".responsive-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); ",
+    "  gap: 15px; margin-top: 15px; }",
+    ".responsive-grid figure { margin: 0; text-align: center; background: #f8f9fa; ",
+    "  border-radius: 4px; padding: 10px; }",
+    ".responsive-grid img { max-width: 100%; height: auto; border: 1px solid #ddd; }",
+    ".responsive-grid figcaption { font-size: 12px; color: #666; margin-top: 5px; }",
+    "h3 { margin-top: 20px; margin-bottom: 10px; color: #555; }",
+    "</style>",
+    "</head>",
+    "<body>",
+    "<h1>Visual Diff Report</h1>",
+])
+
+
+class HtmlReportWriter:
+    """Write the HTML report while pair results are still being computed.
+
+    Each result's detailed section is written to a temporary file as soon as
+    it arrives (results that finish out of order wait until the ones before
+    them are in), keeping only the formatted summary-table fields in memory.
+    close() then writes index.html: the head and summary table, which need
+    every result, followed by the detailed sections copied from the temp file.
+    """
 
-    # Detailed comparisons
-    for r in results:
-        name = r["name"]
+    def __init__(self, output_dir, metric="ssim"):
+        self.output_dir = Path(output_dir)
+        self.metric = metric
+        # The percentage column holds the MSE score under --metric mse
+        self.similarity_label = "MSE" if metric == "mse" else "Pixel"
+        self.rows = []
+        self.counts = {"pass": 0, "fail": 0, "missing": 0}
+        self.has_ssim = False
+        self.has_thumbs = False
+        self._pending = {}
+        self._sections = tempfile.TemporaryFile(
+            "w+", encoding="utf-8", dir=self.output_dir, buffering=1 << 20
+        )
+
+    def _emit(self, line):
+        self._sections.write(line)
+        self._sections.write("\n")
+
+    def add(self, index, r):
+        """Record the result for pair number index (0-based, any order)."""
+        self._pending[index] = r
+        while len(self.rows) in self._pending:
+            self._write_result(self._pending.pop(len(self.rows)))
+
+    def _write_result(self, r):
+        """Format one result's summary fields and write its detailed section."""
+        emit = self._emit
         status = r.get("status", "unknown")
-        similarity = r.get("similarity")
+        if status in self.counts:
+            self.counts[status] += 1
+        similarity = r.get("similarity", "N/A")
+        pixel_str = f"{similarity:.1f}%" if isinstance(similarity, float) else None
+        self.has_thumbs = self.has_thumbs or "thumbnail" in r
         ssim_score = r.get("ssim_score")
+        ssim_str = None
+        if ssim_score is not None:
+            self.has_ssim = True
+            ssim_str = f"{ssim_score:.4f}"
+        name = html.escape(r["name"])
+        status_upper = status.upper()
+        self.rows.append((
+            name, r.get("thumbnail"), pixel_str or str(similarity), ssim_str,
+            status, status_upper,
+        ))
 
-        html_parts.append("<div class='comparison'>")
+        emit("<div class='comparison'>")
 
         # Build header with scores
         score_parts = []
-        if isinstance(similarity, float):
-            score_parts.append(f"Pixel: {similarity:.1f}%")
-        if ssim_score is not None:
-            score_parts.append(f"SSIM: {ssim_score:.4f}")
+        if pixel_str:
+            score_parts.append(f"{self.similarity_label}: {pixel_str}")
+        if ssim_str:
+            score_parts.append(f"SSIM: {ssim_str}")
         score_str = f" - {', '.join(score_parts)}" if score_parts else ""
 
-        html_parts.append(f"<h2>{name}{score_str} "
-                          f"<span class='status {status}'>{status.upper()}</span></h2>")
+        emit(f"<h2>{name}{score_str} "
+             f"<span class='status {status}'>{status_upper}</span></h2>")
 
         if r.get("original_rel") and r.get("clone_rel"):
-            html_parts.append("<div class='images'>")
-            html_parts.append(f"<figure><img src='{r['original_rel']}' alt='Original'>"
-                              f"<figcaption>Original</figcaption></figure>")
-            html_parts.append(f"<figure><img src='{r['clone_rel']}' alt='Clone'>"
-                              f"<figcaption>Clone</figcaption></figure>")
+            # Full-size images load lazily, and only failing pages start expanded
+            emit(f"<details{' open' if status == 'fail' else ''}>"
+                 f"<summary>Screenshots</summary>")
+            emit("<div class='images'>")
+            emit(f"<figure><img src='{html.escape(r['original_rel'])}' alt='Original' "
+                 f"loading='lazy'><figcaption>Original</figcaption></figure>")
+            emit(f"<figure><img src='{html.escape(r['clone_rel'])}' alt='Clone' "
+                 f"loading='lazy'><figcaption>Clone</figcaption></figure>")
             if r.get("diff_rel"):
-                html_parts.append(f"<figure><img src='{r['diff_rel']}' alt='Diff'>"
-                                  f"<figcaption>Diff (red = changed)</figcaption></figure>")
+                emit(f"<figure><img src='{html.escape(r['diff_rel'])}' alt='Diff' "
+                     f"loading='lazy'><figcaption>Diff (red = changed)</figcaption></figure>")
             if r.get("heatmap_rel"):
-                html_parts.append(f"<figure><img src='{r['heatmap_rel']}' alt='SSIM Heatmap'>"
-                                  f"<figcaption>SSIM Heatmap (blue = similar, red = different)"
-                                  f"</figcaption></figure>")
-            html_parts.append("</div>")
-        elif r.get("status") == "missing":
-            html_parts.append("<p>No matching screenshot found for comparison.</p>")
+                emit(f"<figure><img src='{html.escape(r['heatmap_rel'])}' alt='SSIM Heatmap' "
+                     f"loading='lazy'><figcaption>SSIM Heatmap (blue = similar, red = different)"
+                     f"</figcaption></figure>")
+            emit("</div>")
+            emit("</details>")
+        elif status == "missing":
+            emit("<p>No matching screenshot found for comparison.</p>")
 
         # Region breakdown table
         regions = r.get("regions")
         if regions:
-            html_parts.append("<h3>Region Breakdown</h3>")
-            html_parts.append("<table class='region-table'>")
-            html_parts.append("<tr><th>Region</th><th>Score</th><th>Metric</th></tr>")
+            emit("<h3>Region Breakdown</h3>")
+            emit("<table class='region-table'>")
+            emit("<tr><th>Region</th><th>Score</th><th>Metric</th></tr>")
             for region in regions:
                 if region["metric"] == "ssim":
                     score_display = f"{region['score']:.4f}"
                 else:
                     score_display = f"{region['score']:.1f}%"
-                html_parts.append(
+                emit(
                     f"<tr><td>{region['label']}</td>"
                     f"<td class='score'>{score_display}</td>"
                     f"<td>{region['metric'].upper()}</td></tr>"
                 )
-            html_parts.append("</table>")
+            emit("</table>")
 
-        html_parts.append("</div>")
+        emit("</div>")
 
-    # Responsive comparison section
-    if responsive_results:
-        html_parts.append("<div class='comparison'>")
-        html_parts.append("<h2>Responsive Comparisons</h2>")
+    def close(self, responsive_results=None):
+        """Write index.html and return its path."""
+        if self._pending:
+            raise ValueError(
+                f"Report is missing result {len(self.rows)} "
+                f"({len(self._pending)} later results are waiting)"
+            )
+        counts = self.counts
+        report_path = self.output_dir / "index.html"
+        with self._sections as sections, \
+                open(report_path, "w", encoding="utf-8", buffering=1 << 20) as report:
+            def emit(line):
+                report.write(line)
+                report.write("\n")
+
+            emit(_REPORT_HEAD)
+
+            # Summary table
+            emit(f"<p class='summary'>{len(self.rows)} pages compared: "
+                 f"{counts['pass']} passed, {counts['fail']} failed, "
+                 f"{counts['missing']} missing "
+                 f"(primary metric: {METRIC_LABELS[self.metric]})</p>")
+
+            # Summary table with both metrics
+            emit("<table>")
+            header_cols = "<tr><th>Page</th>"
+            if self.has_thumbs:
+                header_cols += "<th>Preview</th>"
+            header_cols += f"<th>{self.similarity_label} Similarity</th>"
+            if self.has_ssim:
+                header_cols += "<th>SSIM Score</th>"
+            header_cols += "<th>Status</th></tr>"
+            emit(header_cols)
+
+            for name, thumb, sim_str, ssim_str, status, status_upper in self.rows:
+                row = f"<tr><td>{name}</td>"
+                if self.has_thumbs:
+                    # Inline data: URI, so the summary renders without fetching images
+                    row += (f"<td><img class='thumb' src='{thumb}' alt=''></td>"
+                            if thumb else "<td></td>")
+                row += f"<td>{sim_str}</td>"
+                if self.has_ssim:
+                    row += f"<td>{ssim_str or 'N/A'}</td>"
+                row += f"<td><span class='status {status}'>{status_upper}</span></td></tr>"
+                emit(row)
+
+            emit("</table>")
+
+            # Detailed comparisons, already rendered as results arrived
+            report.flush()
+            sections.seek(0)
+            shutil.copyfileobj(sections, report, 1 << 20)
+
+            # Responsive comparison section
+            if responsive_results:
+                emit("<div class='comparison'>")
+                emit("<h2>Responsive Comparisons</h2>")
+
+                for page_name, breakpoint_data in responsive_results.items():
+                    emit(f"<h3>{html.escape(page_name)}</h3>")
+                    emit("<div class='responsive-grid'>")
+
+                    for bp_info in breakpoint_data:
+                        width = bp_info["width"]
+                        clone_rel = html.escape(bp_info.get("clone_rel") or "")
+                        orig_rel = html.escape(bp_info.get("original_rel") or "")
+                        bp_score = bp_info.get("score")
+                        bp_metric = bp_info.get("metric", "pixel")
+
+                        if bp_score is not None:
+                            if bp_metric == "ssim":
+                                score_label = f"SSIM: {bp_score:.4f}"
+                            else:
+                                score_label = f"{METRIC_LABELS[bp_metric]}: {bp_score:.1f}%"
+                        else:
+                            score_label = ""
 
-        for page_name, breakpoint_data in responsive_results.items():
-            html_parts.append(f"<h3>{page_name}</h3>")
-            html_parts.append("<div class='responsive-grid'>")
+                        if clone_rel:
+                            emit(
+                                f"<figure><img src='{clone_rel}' alt='Clone at {width}px'>"
+                                f"<figcaption>{width}px {score_label}</figcaption></figure>"
+                            )
 
-            for bp_info in breakpoint_data:
-                width = bp_info["width"]
-                clone_rel = bp_info.get("clone_rel")
-                orig_rel = bp_info.get("original_rel")
-                bp_score = bp_info.get("score")
-                bp_metric = bp_info.get("metric", "pixel")
+                        if orig_rel:
+                            emit(
+                                f"<figure><img src='{orig_rel}' alt='Original at {width}px'>"
+                                f"<figcaption>Original {width}px</figcaption></figure>"
+                            )
 
-                if bp_score is not None:
-                    if bp_metric == "ssim":
-                        score_label = f"SSIM: {bp_score:.4f}"
-                    else:
-                        score_label = f"Pixel: {bp_score:.1f}%"
-                else:
-                    score_label = ""
+                    emit("</div>")
+
+                emit("</div>")
+
+            report.write("</body>\n</html>\n")
+
+        return report_path
+
+
+def generate_html_report(results, output_dir, metric="ssim", responsive_results=None):
+    """Generate an HTML report with side-by-side comparisons."""
+    writer = HtmlReportWriter(output_dir, metric)
+    for index, r in enumerate(results):
+        writer.add(index, r)
+    return writer.close(responsive_results)
+
+
+def load_screenshot(path, max_width=None):
+    """Open a screenshot, downscaling it to at most max_width pixels wide.
+
+    Only the width is capped because full-page captures are tall and narrow;
+    capping the longest side would flatten them to a sliver. thumbnail()
+    applies draft() itself, so JPEGs are decoded at reduced scale, and its
+    reducing_gap does the bulk of a large downscale with a C box reduce()
+    before the final LANCZOS pass.
+    """
+    img = Image.open(path)
+    if max_width and img.width > max_width:
+        height = max(1, round(img.height * max_width / img.width))
+        img.thumbnail((max_width, height), Image.LANCZOS, reducing_gap=2.0)
+    return img
+
+
+def _decode_screenshot(path, max_width=None):
+    """Fully decode a screenshot to RGB; Image.open alone is lazy."""
+    img = load_screenshot(path, max_width)
+    img.load()
+    return _to_rgb(img)
+
+
+# WebP previews are the smallest; Pillow builds without libwebp use JPEG
+_THUMBNAIL_WEBP = features.check("webp")
+
+
+def make_thumbnail_uri(img):
+    """Return a small WebP (or, without WebP support, JPEG) data: URI previewing the top of img.
+
+    Full-page captures are very tall, so the preview crops to the first
+    screen (the THUMBNAIL_SIZE aspect ratio) before scaling down.
+    """
+    box_w, box_h = THUMBNAIL_SIZE
+    top = img.crop((0, 0, img.width, min(img.height, round(img.width * box_h / box_w))))
+    scale = min(box_w / top.width, box_h / top.height, 1.0)
+    size = (max(1, round(top.width * scale)), max(1, round(top.height * scale)))
+    thumb = top.resize(size, Image.BILINEAR, reducing_gap=2.0)
+    buf = io.BytesIO()
+    if _THUMBNAIL_WEBP:
+        thumb.save(buf, "WEBP", quality=70)
+        mime = "image/webp"
+    else:
+        _to_rgb(thumb).save(buf, "JPEG", quality=70)
+        mime = "image/jpeg"
+    return f"data:{mime};base64," + base64.b64encode(buf.getvalue()).decode("ascii")
+
+
+def save_report_image(img, path, compress_level=1):
+    """Save a diff or heatmap image using fast encoder settings for its format.
+
+    These images are viewed once in the report, so PNGs use a low zlib level
+    and WebP uses its fastest lossless mode rather than the smaller defaults.
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix == ".webp":
+        # method=0 with quality=0 is libwebp's fastest lossless preset
+        img.save(path, lossless=True, quality=0, method=0)
+    elif suffix in (".jpg", ".jpeg"):
+        img.save(path, quality=90)
+    else:
+        img.save(path, compress_level=compress_level)
+
+
+def place_file(src, dst, link_mode="hardlink"):
+    """Put src at dst for the report, linking instead of copying where possible.
+
+    link_mode is 'copy', 'hardlink' or 'symlink'. Symlinks are relative so the
+    report keeps working when moved together with the screenshots. A refused
+    symlink (e.g. on Windows) falls back to a hardlink, and a refused hardlink
+    (e.g. across devices) to a copy.
+    """
+    dst = Path(dst)
+    # Already in place: a link from a previous run, or src lives in the report
+    if dst.exists() and os.path.samefile(src, dst):
+        return
+    # Place under a temporary name and swap it in, so a file left by a
+    # previous run is only replaced once the new one exists
+    tmp = dst.with_name(f".{dst.name}.tmp")
+    tmp.unlink(missing_ok=True)
+    try:
+        _link_or_copy(src, tmp, link_mode)
+        os.replace(tmp, dst)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def _link_or_copy(src, dst, link_mode):
+    """Create dst from src per link_mode, falling back as place_file() describes."""
+    if link_mode == "symlink":
+        try:
+            os.symlink(os.path.relpath(Path(src).resolve(), dst.parent.resolve()), dst)
+            return
+        except (OSError, NotImplementedError, ValueError):
+            pass
+    if link_mode != "copy":
+        try:
+            os.link(src, dst)
+            return
+        except (OSError, NotImplementedError):
+            pass
+    shutil.copy2(src, dst)
+
+
+def report_asset(src, dst, output_dir, link_mode="hardlink"):
+    """Make src available to the report and return its report-relative URL.
+
+    With link_mode 'reference' nothing is written: the URL points at src where
+    it already lives. Otherwise src is placed at dst (inside output_dir) with
+    place_file().
+    """
+    if link_mode == "reference":
+        target = Path(src).resolve()
+        try:
+            return Path(os.path.relpath(target, Path(output_dir).resolve())).as_posix()
+        except ValueError:
+            # Different drive on Windows; no relative path exists
+            return target.as_uri()
+    place_file(src, dst, link_mode)
+    return Path(dst).relative_to(output_dir).as_posix()
+
+
+def _copy_into_report(orig_path, clone_path, output_dir, link_mode):
+    """Place a screenshot pair into the report directory.
+
+    Returns the (original, clone) URLs relative to the report.
+    """
+    return (
+        report_asset(orig_path, output_dir / "originals" / orig_path.name,
+                     output_dir, link_mode),
+        report_asset(clone_path, output_dir / "clones" / clone_path.name,
+                     output_dir, link_mode),
+    )
 
-                if clone_rel:
-                    html_parts.append(
-                        f"<figure><img src='{clone_rel}' alt='Clone at {width}px'>"
-                        f"<figcaption>{width}px {score_label}</figcaption></figure>"
-                    )
 
-                if orig_rel:
-                    html_parts.append(
-                        f"<figure><img src='{orig_rel}' alt='Original at {width}px'>"
-                        f"<figcaption>Original {width}px</figcaption></figure>"
-                    )
+def _shows_ssim(metric):
+    """Whether SSIM is computed and shown alongside the primary metric.
+
+    The MSE metric exists to avoid full-resolution passes, so it skips SSIM.
+    """
+    return _HAS_SSIM and metric != "mse"
 
-            html_parts.append("</div>")
 
-        html_parts.append("</div>")
+def _identical_pair(name, orig_path, clone_path, output_dir, metric, num_regions,
+                    link_mode, preview_img=None):
+    """Build the result for a pair whose pixels are identical.
 
-    html_parts.extend(["</body>", "</html>"])
+    preview_img, when the pair was decoded, becomes the table thumbnail.
+    """
+    show_ssim = _shows_ssim(metric)
+    ssim_score = 1.0 if show_ssim else None
+    line = f"{name:<40} {100.0:>9.1f}%"
+    if show_ssim:
+        line += f"  {ssim_score:>8.4f}"
+    line += "  PASS"
+
+    original_rel, clone_rel = _copy_into_report(
+        orig_path, clone_path, output_dir, link_mode
+    )
 
-    report_path = Path(output_dir) / "index.html"
-    report_path.write_text("\n".join(html_parts), encoding="utf-8")
-    return report_path
+    entry = {
+        "name": name,
+        "similarity": 100.0,
+        "ssim_score": ssim_score,
+        "status": "pass",
+        "original_rel": original_rel,
+        "clone_rel": clone_rel,
+    }
+    if preview_img is not None:
+        entry["thumbnail"] = make_thumbnail_uri(preview_img)
+    if num_regions > 1:
+        region_metric = "pixel" if metric == "ssim" and not _HAS_SSIM else metric
+        entry["regions"] = [
+            {
+                "label": _region_label(i, num_regions),
+                "score": 1.0 if region_metric == "ssim" else 100.0,
+                "metric": region_metric,
+            }
+            for i in range(num_regions)
+        ]
+    return entry, [line]
+
+
+def process_pair(orig_path, clone_path, output_dir, metric, threshold, num_regions,
+                 max_width=None, link_mode="hardlink", diff_format="png",
+                 compress_level=1, diff_all=False, ssim_downscale=1, ssim_mode="rgb",
+                 sample_pixels=0):
+    """Compare one original/clone screenshot pair and write its report assets.
+
+    Runs in a worker process, so console output is returned rather than
+    printed. Returns (entry, lines) where entry is the report dict for the
+    pair and lines are the console lines to show for it.
+    """
+    output_dir = Path(output_dir)
+    name = (orig_path or clone_path).stem
+
+    if orig_path is None:
+        return (
+            {"name": name, "status": "missing", "similarity": "N/A"},
+            [f"{name:<40} {'N/A':>10}  MISSING (no original)"],
+        )
+
+    if clone_path is None:
+        return (
+            {"name": name, "status": "missing", "similarity": "N/A"},
+            [f"{name:<40} {'N/A':>10}  MISSING (no clone)"],
+        )
+
+    # Byte-identical files need no decoding: every score is a perfect match
+    if filecmp.cmp(orig_path, clone_path, shallow=False):
+        return _identical_pair(
+            name, orig_path, clone_path, output_dir, metric, num_regions, link_mode
+        )
+
+    try:
+        # Decode and convert each side once; every metric below reuses these.
+        # The clone decodes on a second thread since Pillow's decoders
+        # release the GIL.
+        with ThreadPoolExecutor(max_workers=1) as decoder:
+            clone_future = decoder.submit(_decode_screenshot, clone_path, max_width)
+            orig_img = _decode_screenshot(orig_path, max_width)
+            clone_img = clone_future.result()
+        if clone_img.size != orig_img.size:
+            clone_img = clone_img.resize(orig_img.size, Image.LANCZOS)
+    except Exception as e:
+        return (
+            {"name": name, "status": "fail", "similarity": 0.0},
+            [f"{name:<40} {'ERROR':>10}  {e}"],
+        )
+
+    # Pixel-identical after decoding (e.g. re-encoded PNGs): a C-level
+    # difference and bounding box is far cheaper than any of the metrics
+    if ImageChops.difference(orig_img, clone_img).getbbox() is None:
+        return _identical_pair(
+            name, orig_path, clone_path, output_dir, metric, num_regions, link_mode,
+            preview_img=clone_img,
+        )
+
+    lines = []
+
+    # Calculate SSIM if available
+    show_ssim = _shows_ssim(metric)
+    ssim_score = None
+    ssim_diff_map = None
+    if show_ssim:
+        try:
+            ssim_score, ssim_diff_map = calculate_ssim(
+                orig_img, clone_img, ssim_downscale, ssim_mode
+            )
+        except Exception as e:
+            lines.append(f"  Warning: SSIM calculation failed for {name}: {e}")
+
+    # Only failing pages get a diff image unless diff_all is set. Under SSIM
+    # and MSE the verdict is already known; under pixel it falls out of compare().
+    if metric == "ssim" and ssim_score is not None:
+        failed = ssim_score < threshold
+    elif metric == "mse":
+        mse_similarity = calculate_mse_similarity(orig_img, clone_img)
+        failed = mse_similarity < threshold
+    else:
+        failed = None
+
+    if metric == "mse":
+        # Skip the full-resolution pass entirely for passing pages
+        similarity = mse_similarity
+        diff_img = None
+        if failed or diff_all:
+            _, diff_img = compare(orig_img, clone_img)
+    elif sample_pixels:
+        # Estimate the pixel score from a fixed sample; the full-resolution
+        # pass only runs when a diff image is wanted
+        similarity = calculate_sampled_pixel_similarity(orig_img, clone_img, sample_pixels)
+        if failed is None:
+            failed = similarity < threshold
+        diff_img = None
+        if failed or diff_all:
+            _, diff_img = compare(orig_img, clone_img)
+    else:
+        if diff_all or failed:
+            diff_below = 100.0
+        elif failed is None:
+            # Pixel metric: compare() builds the diff only below the threshold
+            diff_below = threshold
+        else:
+            diff_below = 0.0
+        # The diff image comes from the same pass as the pixel similarity
+        similarity, diff_img = compare(orig_img, clone_img, diff_below)
+        if failed is None:
+            failed = similarity < threshold
+
+    status = "fail" if failed else "pass"
+
+    # Console output
+    line = f"{name:<40} {similarity:>9.1f}%"
+    if show_ssim:
+        ssim_display = f"{ssim_score:.4f}" if ssim_score is not None else "  N/A"
+        line += f"  {ssim_display:>8}"
+    line += f"  {status.upper()}"
+    lines.append(line)
+
+    # Link or copy images into report dir
+    original_rel, clone_rel = _copy_into_report(
+        orig_path, clone_path, output_dir, link_mode
+    )
+
+    entry = {
+        "name": name,
+        "similarity": similarity,
+        "ssim_score": ssim_score,
+        "status": status,
+        "original_rel": original_rel,
+        "clone_rel": clone_rel,
+    }
+
+    # Save diff image for failing (or, with diff_all, any differing) pages
+    if diff_img is not None:
+        diff_name = f"{name}_diff.{diff_format}"
+        save_report_image(diff_img, output_dir / "diffs" / diff_name, compress_level)
+        entry["diff_rel"] = f"diffs/{diff_name}"
+
+    # Inline preview for the summary table: the diff when there is one
+    entry["thumbnail"] = make_thumbnail_uri(diff_img if diff_img is not None else clone_img)
+
+    # Generate SSIM heatmap if available
+    if ssim_diff_map is not None:
+        heatmap_img = generate_ssim_heatmap(ssim_diff_map)
+        heatmap_name = f"{name}_heatmap.{diff_format}"
+        save_report_image(heatmap_img, output_dir / "heatmaps" / heatmap_name, compress_level)
+        entry["heatmap_rel"] = f"heatmaps/{heatmap_name}"
+
+    # Region-based analysis
+    if num_regions > 1:
+        entry["regions"] = calculate_region_scores(
+            orig_img, clone_img, num_regions, metric=metric,
+            ssim_downscale=ssim_downscale, ssim_mode=ssim_mode,
+        )
+
+    return entry, lines
 
 
 def main():
@@ -465,8 +1294,9 @@ def main():
         help="Similarity threshold for pass/fail. Default: 0.95 for SSIM, 95.0 for pixel"
     )
     parser.add_argument(
-        "--metric", choices=["ssim", "pixel"], default="ssim",
-        help="Primary comparison metric (default: ssim)"
+        "--metric", choices=["ssim", "pixel", "mse"], default="ssim",
+        help="Primary comparison metric (default: ssim). 'mse' scores 16x16 "
+             "thumbnails and only runs the full pixel diff on failing pages"
     )
     parser.add_argument(
         "--responsive", action="store_true",
@@ -480,8 +1310,67 @@ def main():
         "--regions", type=int, default=4,
         help="Number of horizontal regions for region-based analysis (default: 4)"
     )
+    parser.add_argument(
+        "--max-width", type=int, default=0,
+        help="Downscale screenshots wider than this before comparing, e.g. 1024; "
+             "much faster on large captures but scores shift slightly "
+             "(default: 0, full resolution)"
+    )
+    parser.add_argument(
+        "--link-mode", choices=["copy", "hardlink", "symlink", "reference"],
+        default="hardlink",
+        help="How screenshots are placed in the report directory (default: hardlink, "
+             "falling back to copy). 'reference' writes nothing and points the "
+             "report at the screenshots where they are"
+    )
+    parser.add_argument(
+        "--diff-format", choices=["png", "jpg", "webp"], default="png",
+        help="Image format for diff and heatmap images (default: png). webp is lossless and "
+             "falls back to png if Pillow lacks WebP support"
+    )
+    parser.add_argument(
+        "--diff-compress-level", type=int, choices=range(10), default=1, metavar="0-9",
+        help="zlib level for PNG diff and heatmap images (default: 1, fastest)"
+    )
+    parser.add_argument(
+        "--diff-all", action="store_true",
+        help="Write diff images for every page that differs, not just failing ones"
+    )
+    parser.add_argument(
+        "--ssim-downscale", type=int, default=1,
+        help="Box-downsample by this factor before SSIM; heatmaps are produced at "
+             "the reduced size. 2 is about 4x faster but shifts scores slightly "
+             "(default: 1, full resolution)"
+    )
+    parser.add_argument(
+        "--ssim-mode", choices=["luma", "rgb"], default="rgb",
+        help="Run SSIM on all three RGB channels or on the luminance plane only; "
+             "luma does a third of the filtering but scores differ from rgb "
+             "(default: rgb)"
+    )
+    parser.add_argument(
+        "--sample-pixels", type=int, default=0,
+        help="Estimate pixel similarity from this many randomly sampled pixels "
+             "(fixed seed) instead of every pixel; 100000 is within ~0.3%% "
+             "(default: 0, compare every pixel)"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 1,
+        help="Worker processes for comparing screenshot pairs (default: CPU count)"
+    )
+    parser.add_argument(
+        "--numba", action="store_true",
+        help="JIT-compile the pixel loops with Numba. Each process spends about "
+             "a second per kernel compiling, so this only helps very large batches "
+             "(default: off, NumPy only)"
+    )
     args = parser.parse_args()
 
+    if args.numba:
+        os.environ["VISUAL_DIFF_NUMBA"] = "1"
+        if not enable_numba():
+            print("Warning: Numba not installed. Falling back to the NumPy code paths.")
+
     # Resolve metric and threshold
     metric = args.metric
     if metric == "ssim" and not _HAS_SSIM:
@@ -489,6 +1378,11 @@ def main():
         print("  Install with: pip install scikit-image numpy")
         metric = "pixel"
 
+    diff_format = args.diff_format
+    if diff_format == "webp" and not features.check("webp"):
+        print("Warning: Pillow was built without WebP support. Saving diffs as PNG.")
+        diff_format = "png"
+
     if args.threshold is not None:
         threshold = args.threshold
     else:
@@ -525,106 +1419,50 @@ def main():
         sys.exit(0)
 
     # Build console output header
-    metric_label = "SSIM" if metric == "ssim" else "Pixel"
+    metric_label = METRIC_LABELS[metric]
     threshold_str = f"{threshold:.4f}" if metric == "ssim" else f"{threshold:.1f}%"
     print(f"Comparing {len(pairs)} page(s) with {metric_label} threshold {threshold_str}...\n")
 
-    header = f"{'Page':<40} {'Pixel %':>10}"
-    if _HAS_SSIM:
+    show_ssim = _shows_ssim(metric)
+    similarity_header = "MSE %" if metric == "mse" else "Pixel %"
+    header = f"{'Page':<40} {similarity_header:>10}"
+    if show_ssim:
         header += f"  {'SSIM':>8}"
     header += f"  {'Status'}"
     print(header)
-    print("-" * (72 if _HAS_SSIM else 62))
-
-    results = []
-
-    for orig_path, clone_path in pairs:
-        name = (orig_path or clone_path).stem
-
-        if orig_path is None:
-            print(f"{name:<40} {'N/A':>10}  MISSING (no original)")
-            results.append({"name": name, "status": "missing", "similarity": "N/A"})
-            continue
-
-        if clone_path is None:
-            print(f"{name:<40} {'N/A':>10}  MISSING (no clone)")
-            results.append({"name": name, "status": "missing", "similarity": "N/A"})
-            continue
-
-        try:
-            orig_img = Image.open(orig_path)
-            clone_img = Image.open(clone_path)
-        except Exception as e:
-            print(f"{name:<40} {'ERROR':>10}  {e}")
-            results.append({"name": name, "status": "fail", "similarity": 0.0})
-            continue
-
-        # Always calculate pixel similarity
-        pixel_similarity = calculate_pixel_similarity(orig_img, clone_img)
-
-        # Calculate SSIM if available
-        ssim_score = None
-        ssim_diff_map = None
-        if _HAS_SSIM:
-            try:
-                ssim_score, ssim_diff_map = calculate_ssim(orig_img, clone_img)
-            except Exception as e:
-                print(f"  Warning: SSIM calculation failed for {name}: {e}")
-
-        # Determine pass/fail based on selected metric
-        if metric == "ssim" and ssim_score is not None:
-            status = "pass" if ssim_score >= threshold else "fail"
-        else:
-            status = "pass" if pixel_similarity >= threshold else "fail"
-
-        # Console output
-        line = f"{name:<40} {pixel_similarity:>9.1f}%"
-        if _HAS_SSIM:
-            ssim_display = f"{ssim_score:.4f}" if ssim_score is not None else "  N/A"
-            line += f"  {ssim_display:>8}"
-        line += f"  {status.upper()}"
-        print(line)
-
-        # Copy images into report dir
-        import shutil
-        orig_report = report_originals / orig_path.name
-        clone_report = report_clones / clone_path.name
-        shutil.copy2(orig_path, orig_report)
-        shutil.copy2(clone_path, clone_report)
-
-        entry = {
-            "name": name,
-            "similarity": pixel_similarity,
-            "ssim_score": ssim_score,
-            "status": status,
-            "original_rel": f"originals/{orig_path.name}",
-            "clone_rel": f"clones/{clone_path.name}",
-        }
-
-        # Generate diff image if below 100% pixel similarity
-        if pixel_similarity < 100.0:
-            diff_img = generate_diff_image(orig_img, clone_img)
-            diff_path = diff_images_dir / f"{name}_diff.png"
-            diff_img.save(diff_path)
-            entry["diff_rel"] = f"diffs/{name}_diff.png"
-
-        # Generate SSIM heatmap if available
-        if ssim_diff_map is not None:
-            heatmap_img = generate_ssim_heatmap(ssim_diff_map)
-            heatmap_path = heatmaps_dir / f"{name}_heatmap.png"
-            heatmap_img.save(heatmap_path)
-            entry["heatmap_rel"] = f"heatmaps/{name}_heatmap.png"
-
-        # Region-based analysis
-        if args.regions > 1:
-            regions = calculate_region_scores(
-                orig_img, clone_img, args.regions, metric=metric
-            )
-            entry["regions"] = regions
-
-        results.append(entry)
+    print("-" * (72 if show_ssim else 62))
+
+    results = [None] * len(pairs)
+    jobs = [
+        (orig_path, clone_path, output_dir, metric, threshold, args.regions,
+         args.max_width, args.link_mode, diff_format, args.diff_compress_level,
+         args.diff_all, args.ssim_downscale, args.ssim_mode, args.sample_pixels)
+        for orig_path, clone_path in pairs
+    ]
 
-    print("-" * (72 if _HAS_SSIM else 62))
+    # Each pair is independent, so compare them across worker processes and
+    # print lines as they finish. The report writes each result's section as
+    # it arrives, keeping the original pair order.
+    report = HtmlReportWriter(output_dir, metric)
+    workers = min(args.workers, len(jobs))
+    if workers <= 1:
+        for index, job in enumerate(jobs):
+            results[index], lines = process_pair(*job)
+            report.add(index, results[index])
+            print("\n".join(lines))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(process_pair, *job): index
+                for index, job in enumerate(jobs)
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                results[index], lines = future.result()
+                report.add(index, results[index])
+                print("\n".join(lines))
+
+    print("-" * (72 if show_ssim else 62))
     passed = sum(1 for r in results if r.get("status") == "pass")
     failed = sum(1 for r in results if r.get("status") == "fail")
     missing = sum(1 for r in results if r.get("status") == "missing")
@@ -641,7 +1479,8 @@ def main():
                 if region["metric"] == "ssim":
                     print(f"    {region['label']:<25} SSIM: {region['score']:.4f}")
                 else:
-                    print(f"    {region['label']:<25} Pixel: {region['score']:.1f}%")
+                    print(f"    {region['label']:<25} "
+                          f"{METRIC_LABELS[region['metric']]}: {region['score']:.1f}%")
 
     # Responsive testing
     responsive_results = {}
@@ -659,14 +1498,12 @@ def main():
             print("  No HTML files found in clone directory for responsive testing.")
             print("  Responsive testing requires HTML files (not PNGs) in --clone directory.")
         else:
+            # One browser for every file, one page per file
+            rendered = render_pages_at_breakpoints(html_files, breakpoints, responsive_dir)
+
             for html_file in html_files:
                 page_name = html_file.stem
-                print(f"  Rendering {page_name} at {len(breakpoints)} breakpoints...")
-
-                page_responsive_dir = responsive_dir / page_name
-                screenshots = render_html_at_breakpoints(
-                    html_file, breakpoints, page_responsive_dir
-                )
+                screenshots = rendered.get(page_name)
 
                 if not screenshots:
                     print(f"    Skipped (Playwright not available)")
@@ -674,16 +1511,16 @@ def main():
 
                 breakpoint_data = []
                 for width, screenshot_path in sorted(screenshots.items()):
-                    # Copy screenshot into report dir
-                    import shutil
+                    # Link or copy screenshot into report dir
                     responsive_report_dir = output_dir / "responsive_report" / page_name
                     responsive_report_dir.mkdir(parents=True, exist_ok=True)
                     report_screenshot = responsive_report_dir / screenshot_path.name
-                    shutil.copy2(screenshot_path, report_screenshot)
 
                     bp_entry = {
                         "width": width,
-                        "clone_rel": f"responsive_report/{page_name}/{screenshot_path.name}",
+                        "clone_rel": report_asset(
+                            screenshot_path, report_screenshot, output_dir, args.link_mode
+                        ),
                     }
 
                     # Look for matching original screenshot with responsive naming
@@ -694,23 +1531,30 @@ def main():
                         orig_responsive = orig_candidates[0] if orig_candidates else None
 
                     if orig_responsive and orig_responsive.exists():
-                        # Copy original responsive screenshot
+                        # Link or copy original responsive screenshot
                         orig_resp_report = responsive_report_dir / f"orig-{orig_responsive.name}"
-                        shutil.copy2(orig_responsive, orig_resp_report)
-                        bp_entry["original_rel"] = (
-                            f"responsive_report/{page_name}/orig-{orig_responsive.name}"
+                        bp_entry["original_rel"] = report_asset(
+                            orig_responsive, orig_resp_report, output_dir, args.link_mode
                         )
 
                         # Compare
                         try:
-                            clone_img = Image.open(screenshot_path)
-                            orig_img = Image.open(orig_responsive)
+                            clone_img = _decode_screenshot(screenshot_path, args.max_width)
+                            orig_img = _decode_screenshot(orig_responsive, args.max_width)
 
                             if metric == "ssim" and _HAS_SSIM:
-                                score, _ = calculate_ssim(orig_img, clone_img)
+                                score, _ = calculate_ssim(
+                                    orig_img, clone_img, args.ssim_downscale,
+                                    args.ssim_mode,
+                                )
                                 bp_entry["score"] = score
                                 bp_entry["metric"] = "ssim"
                                 score_display = f"SSIM: {score:.4f}"
+                            elif metric == "mse":
+                                score = calculate_mse_similarity(orig_img, clone_img)
+                                bp_entry["score"] = score
+                                bp_entry["metric"] = "mse"
+                                score_display = f"MSE: {score:.1f}%"
                             else:
                                 score = calculate_pixel_similarity(orig_img, clone_img)
                                 bp_entry["score"] = score
@@ -727,9 +1571,7 @@ def main():
 
                 responsive_results[page_name] = breakpoint_data
 
-    report_path = generate_html_report(
-        results, output_dir, metric=metric, responsive_results=responsive_results
-    )
+    report_path = report.close(responsive_results)
     print(f"\nReport: {report_path}")
     print("Done.")
 
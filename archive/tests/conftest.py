@@ -1,7 +1,10 @@
 """Pytest configuration and shared fixtures for the website-cloning-toolkit test suite."""
 
+import functools
+import importlib.util
 import os
 import struct
+import sys
 import zlib
 import pytest
 
@@ -13,11 +16,37 @@ def pytest_configure(config):
     )
 
 
+# ---------------------------------------------------------------------------
+# Loading scripts/ modules by filename (handles hyphenated names)
+# ---------------------------------------------------------------------------
+
+SCRIPTS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+# The repository's own scripts/ (site scraping and template sync), outside archive/
+TOOLKIT_SCRIPTS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'scripts'))
+
+
+@functools.lru_cache(maxsize=None)
+def load_script(name, scripts_dir=SCRIPTS_DIR):
+    """Load a Python script from the scripts/ directory by filename.
+
+    The module is registered in sys.modules, so the script's top-level code
+    runs once per interpreter however many times it is loaded.
+    """
+    module_name = name.replace('-', '_').replace('.py', '')
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(module_name, os.path.join(scripts_dir, name))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    sys.modules[module_name] = module
+    return module
+
+
 # ---------------------------------------------------------------------------
 # Sample HTML fixtures
 # ---------------------------------------------------------------------------
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_html_valid():
     """Minimal valid HTML page that passes all QA checks."""
     return """<!DOCTYPE html>
@@ -42,7 +71,7 @@ def sample_html_valid():
 </html>"""
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_html_invalid():
     """HTML page with multiple QA issues for testing detection."""
     return """<html>
@@ -69,7 +98,7 @@ def sample_html_invalid():
 # Sample CSS fixtures
 # ---------------------------------------------------------------------------
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_css():
     """CSS content with colors, typography, spacing, components, and custom properties."""
     return """\
@@ -166,13 +195,13 @@ a:hover {
 """
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_css_empty():
     """Empty CSS content."""
     return ""
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_css_malformed():
     """Malformed CSS that should be handled gracefully."""
     return """\
@@ -195,19 +224,21 @@ h1 {
 # Temporary directory fixtures
 # ---------------------------------------------------------------------------
 
-@pytest.fixture
-def temp_css_file(tmp_path, sample_css):
+# Written once per session; a test that needs to modify these files should
+# use its own function-scoped copy instead.
+
+@pytest.fixture(scope="session")
+def temp_css_file(tmp_path_factory, sample_css):
     """Write sample CSS to a temp file and return the path."""
-    css_file = tmp_path / "style.css"
+    css_file = tmp_path_factory.mktemp("css") / "style.css"
     css_file.write_text(sample_css, encoding="utf-8")
     return css_file
 
 
-@pytest.fixture
-def temp_html_dir(tmp_path, sample_html_valid):
+@pytest.fixture(scope="session")
+def temp_html_dir(tmp_path_factory, sample_html_valid):
     """Write sample HTML files to a temp directory and return the path."""
-    html_dir = tmp_path / "pages"
-    html_dir.mkdir()
+    html_dir = tmp_path_factory.mktemp("pages")
     (html_dir / "index.html").write_text(sample_html_valid, encoding="utf-8")
     return html_dir
 
@@ -216,93 +247,111 @@ def temp_html_dir(tmp_path, sample_html_valid):
 # Sample image fixtures
 # ---------------------------------------------------------------------------
 
+def _png_chunk(chunk_type, data):
+    """Wrap data in a PNG chunk with its length and CRC."""
+    raw = chunk_type + data
+    return struct.pack(">I", len(data)) + raw + struct.pack(">I", zlib.crc32(raw) & 0xFFFFFFFF)
+
+
+# PNG signature and IEND never change; IHDR only varies with the size
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+_IEND_CHUNK = _png_chunk(b'IEND', b'')
+
+
+@functools.lru_cache(maxsize=None)
+def _ihdr_chunk(width, height):
+    """IHDR chunk for an 8-bit RGB image of the given size."""
+    return _png_chunk(b'IHDR', struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+
+
+def _encode_png(width, height, raw_rows):
+    """Encode filtered 8-bit RGB rows as a complete PNG file."""
+    # Throwaway fixtures: the fastest zlib level still gives a valid PNG
+    idat = _png_chunk(b'IDAT', zlib.compress(raw_rows, 1))
+    return _PNG_SIGNATURE + _ihdr_chunk(width, height) + idat + _IEND_CHUNK
+
+
+@functools.lru_cache(maxsize=None)
 def _create_solid_png(width, height, r, g, b):
     """Create a minimal valid PNG file as bytes with a solid color.
 
     Uses raw zlib-compressed IDAT chunks -- no Pillow dependency needed
-    for fixture creation itself.
+    for fixture creation itself. Cached, so each distinct image is only
+    compressed once per session.
     """
-    def _chunk(chunk_type, data):
-        raw = chunk_type + data
-        return struct.pack(">I", len(data)) + raw + struct.pack(">I", zlib.crc32(raw) & 0xFFFFFFFF)
+    # IDAT -- raw image data: each row starts with filter byte 0 (None)
+    row = b'\x00' + bytes([r, g, b]) * width
+    return _encode_png(width, height, row * height)
 
-    # PNG signature
-    signature = b'\x89PNG\r\n\x1a\n'
 
-    # IHDR
-    ihdr_data = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)  # 8-bit RGB
-    ihdr = _chunk(b'IHDR', ihdr_data)
+@functools.lru_cache(maxsize=None)
+def _create_two_band_png(width, height, top_rows, top_rgb, bottom_rgb):
+    """Create a PNG whose first top_rows rows are top_rgb and the rest bottom_rgb."""
+    # Each row starts with filter byte 0 (None)
+    top_row = b'\x00' + bytes(top_rgb) * width
+    bottom_row = b'\x00' + bytes(bottom_rgb) * width
+    return _encode_png(width, height, top_row * top_rows + bottom_row * (height - top_rows))
 
-    # IDAT -- raw image data: each row starts with filter byte 0 (None)
-    raw_rows = b''
-    for _ in range(height):
-        raw_rows += b'\x00' + bytes([r, g, b]) * width
-    idat_data = zlib.compress(raw_rows)
-    idat = _chunk(b'IDAT', idat_data)
 
-    # IEND
-    iend = _chunk(b'IEND', b'')
+# Non-solid fixture image, encoded once at import; solid colours come from
+# the cached _create_solid_png through make_solid_png
+_BLUE_TOP_RED_100_PNG = _create_two_band_png(100, 100, 5, (0, 0, 255), (255, 0, 0))
+
+
+# The image files are never modified by tests, so they are written once into
+# a shared session directory rather than into every test's tmp_path.
+
+@pytest.fixture(scope="session")
+def sample_image_dir(tmp_path_factory):
+    """Session-wide directory holding the sample image files."""
+    return tmp_path_factory.mktemp("images")
 
-    return signature + ihdr + idat + iend
 
+@pytest.fixture(scope="session")
+def make_solid_png(sample_image_dir):
+    """Factory: make_solid_png(name, width, height, r, g, b) -> Path.
 
-@pytest.fixture
-def sample_image_red(tmp_path):
+    Writes a solid-colour PNG into the session image directory once per name,
+    size and colour; the file name carries all three, so reusing a name with
+    other parameters gives a new file rather than a stale one.
+    """
+    def _make(name, width, height, r, g, b):
+        stem, suffix = os.path.splitext(name)
+        path = sample_image_dir / f"{stem}_{width}x{height}_{r:02x}{g:02x}{b:02x}{suffix}"
+        if not path.exists():
+            path.write_bytes(_create_solid_png(width, height, r, g, b))
+        return path
+    return _make
+
+
+@pytest.fixture(scope="session")
+def sample_image_red(make_solid_png):
     """Create a small solid red 100x100 PNG and return the path."""
-    path = tmp_path / "red.png"
-    path.write_bytes(_create_solid_png(100, 100, 255, 0, 0))
-    return path
+    return make_solid_png("red.png", 100, 100, 255, 0, 0)
 
 
-@pytest.fixture
-def sample_image_blue(tmp_path):
+@pytest.fixture(scope="session")
+def sample_image_blue(make_solid_png):
     """Create a small solid blue 100x100 PNG and return the path."""
-    path = tmp_path / "blue.png"
-    path.write_bytes(_create_solid_png(100, 100, 0, 0, 255))
-    return path
+    return make_solid_png("blue.png", 100, 100, 0, 0, 255)
 
 
-@pytest.fixture
-def sample_image_red_copy(tmp_path):
+@pytest.fixture(scope="session")
+def sample_image_red_copy(make_solid_png):
     """Create a second identical red 100x100 PNG (for identical-image tests)."""
-    path = tmp_path / "red_copy.png"
-    path.write_bytes(_create_solid_png(100, 100, 255, 0, 0))
-    return path
+    return make_solid_png("red_copy.png", 100, 100, 255, 0, 0)
 
 
-@pytest.fixture
-def sample_image_slightly_different(tmp_path):
+@pytest.fixture(scope="session")
+def sample_image_slightly_different(sample_image_dir):
     """Create a 100x100 PNG that is mostly red but with a few blue pixels."""
-    # Build mostly-red image with ~5% blue pixels along top rows
-    width, height = 100, 100
-    raw_rows = b''
-    for y in range(height):
-        raw_rows += b'\x00'  # filter byte
-        for x in range(width):
-            if y < 5:  # top 5 rows are blue
-                raw_rows += bytes([0, 0, 255])
-            else:
-                raw_rows += bytes([255, 0, 0])
-    idat_data = zlib.compress(raw_rows)
-
-    signature = b'\x89PNG\r\n\x1a\n'
-
-    def _chunk(chunk_type, data):
-        raw = chunk_type + data
-        return struct.pack(">I", len(data)) + raw + struct.pack(">I", zlib.crc32(raw) & 0xFFFFFFFF)
-
-    ihdr = _chunk(b'IHDR', struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
-    idat = _chunk(b'IDAT', idat_data)
-    iend = _chunk(b'IEND', b'')
-
-    path = tmp_path / "slightly_different.png"
-    path.write_bytes(signature + ihdr + idat + iend)
+    # Mostly-red image with ~5% blue pixels along the top 5 rows
+    path = sample_image_dir / "slightly_different.png"
+    path.write_bytes(_BLUE_TOP_RED_100_PNG)
     return path
 
 
-@pytest.fixture
-def sample_image_small(tmp_path):
+@pytest.fixture(scope="session")
+def sample_image_small(make_solid_png):
     """Create a small 50x50 red PNG (different size from 100x100 fixtures)."""
-    path = tmp_path / "small.png"
-    path.write_bytes(_create_solid_png(50, 50, 255, 0, 0))
-    return path
+    return make_solid_png("small.png", 50, 50, 255, 0, 0)
@@ -1,28 +1,43 @@
 """Unit tests for scripts/extract-design-system.py."""
 
-import importlib.util
 import json
-import os
+import re
 
 import pytest
 
+from conftest import load_script
 
-# ---------------------------------------------------------------------------
-# Import the script module using importlib (handles hyphenated filename)
-# ---------------------------------------------------------------------------
+eds = load_script('extract-design-system.py')
 
-def load_script(name):
-    """Load a Python script from the scripts/ directory by filename."""
-    path = os.path.join(os.path.dirname(__file__), '..', 'scripts', name)
-    path = os.path.abspath(path)
-    module_name = name.replace('-', '_').replace('.py', '')
-    spec = importlib.util.spec_from_file_location(module_name, path)
-    module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(module)
-    return module
+# Leading number of a spacing value such as "20px" or "-1.5em"
+_SPACING_NUM_RE = re.compile(r'^-?(\d+(\.\d+)?)')
 
 
-eds = load_script('extract-design-system.py')
+@pytest.fixture(scope="module")
+def parsed_sample_sheet(sample_css):
+    """sample_css parsed by cssutils once for the module (read-only)."""
+    return eds.cssutils.parseString(sample_css)
+
+
+@pytest.fixture(scope="module")
+def parsed_sample_tokens(sample_css, parsed_sample_sheet):
+    """Design tokens extracted from sample_css, parsed once for the module.
+
+    Shared between tests, so tests must treat it as read-only.
+    """
+    return eds.extract_design_tokens_from_css(sample_css, sheet=parsed_sample_sheet)
+
+
+@pytest.fixture(scope="module")
+def flattened_colors(parsed_sample_tokens):
+    """Every color value in parsed_sample_tokens, across all categories."""
+    return [entry["value"] for entries in parsed_sample_tokens["colors"].values() for entry in entries]
+
+
+@pytest.fixture(scope="module")
+def flattened_component_selectors(parsed_sample_tokens):
+    """The selector of every component in parsed_sample_tokens."""
+    return [c["selector"] for c in parsed_sample_tokens["components"]]
 
 
 # ---------------------------------------------------------------------------
@@ -32,26 +47,18 @@ eds = load_script('extract-design-system.py')
 class TestColorExtraction:
     """Tests for CSS color extraction."""
 
-    def test_extracts_hex_colors(self, sample_css):
-        result = eds.extract_design_tokens_from_css(sample_css)
-        # Flatten all color values across categories
-        all_color_values = []
-        for category_colors in result["colors"].values():
-            for entry in category_colors:
-                all_color_values.append(entry["value"])
+    def test_extracts_hex_colors(self, flattened_colors):
         # cssutils may shorten hex colors (#333333 -> #333), so check for either form
-        assert any("#333333" in v or "#333" in v for v in all_color_values), \
-            f"Expected #333333 or #333 in colors, got: {all_color_values}"
+        assert any("#333333" in v or "#333" in v for v in flattened_colors), \
+            f"Expected #333333 or #333 in colors, got: {flattened_colors}"
 
-    def test_extracts_color_categories(self, sample_css):
-        result = eds.extract_design_tokens_from_css(sample_css)
+    def test_extracts_color_categories(self, parsed_sample_tokens):
         # body color -> primary category, background-color -> neutral category
-        assert "primary" in result["colors"], "Expected 'primary' color category"
-        assert "neutral" in result["colors"], "Expected 'neutral' color category"
+        assert "primary" in parsed_sample_tokens["colors"], "Expected 'primary' color category"
+        assert "neutral" in parsed_sample_tokens["colors"], "Expected 'neutral' color category"
 
-    def test_color_entries_have_selectors(self, sample_css):
-        result = eds.extract_design_tokens_from_css(sample_css)
-        for category, entries in result["colors"].items():
+    def test_color_entries_have_selectors(self, parsed_sample_tokens):
+        for category, entries in parsed_sample_tokens["colors"].items():
             for entry in entries:
                 assert "value" in entry, f"Color entry missing 'value' key in {category}"
                 assert "property" in entry, f"Color entry missing 'property' key in {category}"
@@ -66,39 +73,35 @@ class TestColorExtraction:
 class TestTypographyExtraction:
     """Tests for CSS typography extraction."""
 
-    def test_extracts_heading_typography(self, sample_css):
-        result = eds.extract_design_tokens_from_css(sample_css)
-        typography = result["typography"]
+    def test_extracts_heading_typography(self, parsed_sample_tokens):
+        typography = parsed_sample_tokens["typography"]
         assert "h1" in typography, "Expected h1 typography definition"
         assert "h2" in typography, "Expected h2 typography definition"
 
-    def test_h1_has_correct_font_size(self, sample_css):
-        result = eds.extract_design_tokens_from_css(sample_css)
-        h1 = result["typography"].get("h1", {})
-        assert h1.get("fontSize") == "36px", f"Expected h1 fontSize=36px, got {h1.get('fontSize')}"
-
-    def test_h1_has_correct_font_weight(self, sample_css):
-        result = eds.extract_design_tokens_from_css(sample_css)
-        h1 = result["typography"].get("h1", {})
-        assert h1.get("fontWeight") == "700", f"Expected h1 fontWeight=700, got {h1.get('fontWeight')}"
-
-    def test_extracts_body_typography(self, sample_css):
-        result = eds.extract_design_tokens_from_css(sample_css)
-        typography = result["typography"]
+    @pytest.mark.parametrize("element,prop,expected", [
+        ("h1", "fontSize", "36px"),
+        ("h1", "fontWeight", "700"),
+        ("h2", "fontSize", "28px"),
+        ("h2", "fontWeight", "600"),
+    ])
+    def test_heading_token_value(self, parsed_sample_tokens, element, prop, expected):
+        value = parsed_sample_tokens["typography"].get(element, {}).get(prop)
+        assert value == expected, f"Expected {element} {prop}={expected}, got {value}"
+
+    def test_extracts_body_typography(self, parsed_sample_tokens):
+        typography = parsed_sample_tokens["typography"]
         assert "body" in typography, "Expected body typography definition"
         body = typography["body"]
         assert "fontFamily" in body, "Expected fontFamily in body typography"
         assert "fontSize" in body, "Expected fontSize in body typography"
 
-    def test_body_font_family_value(self, sample_css):
-        result = eds.extract_design_tokens_from_css(sample_css)
-        body = result["typography"].get("body", {})
+    def test_body_font_family_value(self, parsed_sample_tokens):
+        body = parsed_sample_tokens["typography"].get("body", {})
         assert "Open Sans" in body.get("fontFamily", ""), \
             f"Expected 'Open Sans' in body fontFamily, got {body.get('fontFamily')}"
 
-    def test_typography_uses_camel_case_keys(self, sample_css):
-        result = eds.extract_design_tokens_from_css(sample_css)
-        for element, props in result["typography"].items():
+    def test_typography_uses_camel_case_keys(self, parsed_sample_tokens):
+        for element, props in parsed_sample_tokens["typography"].items():
             for key in props:
                 assert key in ("fontFamily", "fontSize", "fontWeight", "lineHeight"), \
                     f"Unexpected typography key '{key}' for {element}"
@@ -111,29 +114,21 @@ class TestTypographyExtraction:
 class TestSpacingExtraction:
     """Tests for CSS spacing value extraction."""
 
-    def test_extracts_spacing_values(self, sample_css):
-        result = eds.extract_design_tokens_from_css(sample_css)
-        spacing = result["spacing"]["values"]
+    def test_extracts_spacing_values(self, parsed_sample_tokens):
+        spacing = parsed_sample_tokens["spacing"]["values"]
         assert isinstance(spacing, list), "spacing.values should be a list"
         assert len(spacing) > 0, "Expected at least one spacing value"
 
-    def test_spacing_contains_known_values(self, sample_css):
-        result = eds.extract_design_tokens_from_css(sample_css)
-        spacing = result["spacing"]["values"]
+    def test_spacing_contains_known_values(self, parsed_sample_tokens):
+        spacing = parsed_sample_tokens["spacing"]["values"]
         # CSS has margin-bottom: 20px, padding: 10px 20px, etc.
         assert any("20px" in v for v in spacing), \
             f"Expected '20px' in spacing values, got: {spacing}"
 
-    def test_spacing_values_are_sorted(self, sample_css):
-        result = eds.extract_design_tokens_from_css(sample_css)
-        spacing = result["spacing"]["values"]
+    def test_spacing_values_are_sorted(self, parsed_sample_tokens):
+        spacing = parsed_sample_tokens["spacing"]["values"]
         # Verify numeric sort order
-        import re
-        nums = []
-        for val in spacing:
-            m = re.match(r'^-?(\d+(\.\d+)?)', val)
-            if m:
-                nums.append(float(m.group(1)))
+        nums = [float(m.group(1)) for val in spacing if (m := _SPACING_NUM_RE.match(val))]
         assert nums == sorted(nums), "Spacing values should be sorted numerically"
 
 
@@ -144,17 +139,15 @@ class TestSpacingExtraction:
 class TestBreakpointExtraction:
     """Tests for @media query breakpoint extraction."""
 
-    def test_extracts_breakpoints_from_media_queries(self, sample_css):
-        result = eds.extract_design_tokens_from_css(sample_css)
-        breakpoints = result["layout"]["breakpoints"]
+    def test_extracts_breakpoints_from_media_queries(self, parsed_sample_tokens):
+        breakpoints = parsed_sample_tokens["layout"]["breakpoints"]
         assert isinstance(breakpoints, list), "breakpoints should be a list"
         # CSS has @media (max-width: 768px) and @media (max-width: 480px)
         assert 768 in breakpoints, f"Expected 768 in breakpoints, got: {breakpoints}"
         assert 480 in breakpoints, f"Expected 480 in breakpoints, got: {breakpoints}"
 
-    def test_breakpoints_are_sorted(self, sample_css):
-        result = eds.extract_design_tokens_from_css(sample_css)
-        breakpoints = result["layout"]["breakpoints"]
+    def test_breakpoints_are_sorted(self, parsed_sample_tokens):
+        breakpoints = parsed_sample_tokens["layout"]["breakpoints"]
         assert breakpoints == sorted(breakpoints), "Breakpoints should be sorted ascending"
 
 
@@ -165,22 +158,19 @@ class TestBreakpointExtraction:
 class TestCustomProperties:
     """Tests for CSS custom property (variable) extraction from :root."""
 
-    def test_extracts_custom_properties(self, sample_css):
-        result = eds.extract_design_tokens_from_css(sample_css)
-        custom_props = result["customProperties"]
+    def test_extracts_custom_properties(self, parsed_sample_tokens):
+        custom_props = parsed_sample_tokens["customProperties"]
         assert isinstance(custom_props, dict), "customProperties should be a dict"
         assert len(custom_props) > 0, "Expected at least one custom property"
 
-    def test_custom_properties_include_known_vars(self, sample_css):
-        result = eds.extract_design_tokens_from_css(sample_css)
-        custom_props = result["customProperties"]
+    def test_custom_properties_include_known_vars(self, parsed_sample_tokens):
+        custom_props = parsed_sample_tokens["customProperties"]
         assert "--primary-color" in custom_props, "Expected --primary-color in custom properties"
         assert custom_props["--primary-color"] == "#333333", \
             f"Expected --primary-color=#333333, got {custom_props.get('--primary-color')}"
 
-    def test_custom_properties_include_font_vars(self, sample_css):
-        result = eds.extract_design_tokens_from_css(sample_css)
-        custom_props = result["customProperties"]
+    def test_custom_properties_include_font_vars(self, parsed_sample_tokens):
+        custom_props = parsed_sample_tokens["customProperties"]
         assert "--font-heading" in custom_props, "Expected --font-heading in custom properties"
         assert "Montserrat" in custom_props["--font-heading"]
 
@@ -192,32 +182,26 @@ class TestCustomProperties:
 class TestComponentDetection:
     """Tests for component detection (class selectors with 3+ declarations)."""
 
-    def test_detects_components_with_3_plus_declarations(self, sample_css):
-        result = eds.extract_design_tokens_from_css(sample_css)
-        components = result["components"]
+    def test_detects_components_with_3_plus_declarations(self, parsed_sample_tokens):
+        components = parsed_sample_tokens["components"]
         assert isinstance(components, list), "components should be a list"
         # .bldr_callout has 5 properties, .bldr_cta has 6 properties
         assert len(components) > 0, "Expected at least one component"
 
-    def test_component_has_expected_keys(self, sample_css):
-        result = eds.extract_design_tokens_from_css(sample_css)
-        components = result["components"]
+    def test_component_has_expected_keys(self, parsed_sample_tokens):
+        components = parsed_sample_tokens["components"]
         for comp in components:
             assert "selector" in comp, "Component missing 'selector' key"
             assert "properties" in comp, "Component missing 'properties' key"
             assert "usedInHtml" in comp, "Component missing 'usedInHtml' key"
 
-    def test_components_include_bldr_callout(self, sample_css):
-        result = eds.extract_design_tokens_from_css(sample_css)
-        component_selectors = [c["selector"] for c in result["components"]]
-        assert any(".bldr_callout" in s for s in component_selectors), \
-            f"Expected .bldr_callout component, got selectors: {component_selectors}"
+    def test_components_include_bldr_callout(self, flattened_component_selectors):
+        assert any(".bldr_callout" in s for s in flattened_component_selectors), \
+            f"Expected .bldr_callout component, got selectors: {flattened_component_selectors}"
 
-    def test_components_include_bldr_cta(self, sample_css):
-        result = eds.extract_design_tokens_from_css(sample_css)
-        component_selectors = [c["selector"] for c in result["components"]]
-        assert any(".bldr_cta" in s for s in component_selectors), \
-            f"Expected .bldr_cta component, got selectors: {component_selectors}"
+    def test_components_include_bldr_cta(self, flattened_component_selectors):
+        assert any(".bldr_cta" in s for s in flattened_component_selectors), \
+            f"Expected .bldr_cta component, got selectors: {flattened_component_selectors}"
 
 
 # ---------------------------------------------------------------------------
@@ -227,26 +211,36 @@ class TestComponentDetection:
 class TestOutputSchema:
     """Tests for the output JSON schema structure."""
 
-    def test_output_has_all_top_level_keys(self, sample_css):
-        result = eds.extract_design_tokens_from_css(sample_css)
+    def test_output_has_all_top_level_keys(self, parsed_sample_tokens):
         expected_keys = {"colors", "typography", "spacing", "layout", "customProperties", "components"}
-        assert set(result.keys()) == expected_keys, \
-            f"Expected keys {expected_keys}, got {set(result.keys())}"
+        assert set(parsed_sample_tokens.keys()) == expected_keys, \
+            f"Expected keys {expected_keys}, got {set(parsed_sample_tokens.keys())}"
 
-    def test_layout_has_max_width_and_breakpoints(self, sample_css):
-        result = eds.extract_design_tokens_from_css(sample_css)
-        layout = result["layout"]
+    def test_layout_has_max_width_and_breakpoints(self, parsed_sample_tokens):
+        layout = parsed_sample_tokens["layout"]
         assert "maxWidth" in layout, "layout missing 'maxWidth' key"
         assert "breakpoints" in layout, "layout missing 'breakpoints' key"
 
-    def test_output_is_json_serializable(self, sample_css):
-        result = eds.extract_design_tokens_from_css(sample_css)
+    def test_output_is_json_serializable(self, parsed_sample_tokens):
         # Should not raise
-        serialized = json.dumps(result, indent=2)
+        serialized = json.dumps(parsed_sample_tokens)
         assert isinstance(serialized, str)
         # Should round-trip cleanly
         parsed = json.loads(serialized)
-        assert parsed.keys() == result.keys()
+        assert parsed.keys() == parsed_sample_tokens.keys()
+
+
+# ---------------------------------------------------------------------------
+# Pre-parsed stylesheet tests
+# ---------------------------------------------------------------------------
+
+class TestPreParsedSheet:
+    """Tests for passing an already-parsed stylesheet to the extractor."""
+
+    def test_pre_parsed_sheet_matches_text_parse(self, sample_css, parsed_sample_sheet):
+        from_text = eds.extract_design_tokens_from_css(sample_css)
+        from_sheet = eds.extract_design_tokens_from_css(sample_css, sheet=parsed_sample_sheet)
+        assert from_sheet == from_text
 
 
 # ---------------------------------------------------------------------------
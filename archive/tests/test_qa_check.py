@@ -1,27 +1,11 @@
 """Unit tests for scripts/qa-check.py."""
 
-import importlib.util
-import os
 import re
 from pathlib import Path
 
 import pytest
 
-
-# ---------------------------------------------------------------------------
-# Import the script module using importlib (handles hyphenated filename)
-# ---------------------------------------------------------------------------
-
-def load_script(name):
-    """Load a Python script from the scripts/ directory by filename."""
-    path = os.path.join(os.path.dirname(__file__), '..', 'scripts', name)
-    path = os.path.abspath(path)
-    module_name = name.replace('-', '_').replace('.py', '')
-    spec = importlib.util.spec_from_file_location(module_name, path)
-    module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(module)
-    return module
-
+from conftest import load_script
 
 qa = load_script('qa-check.py')
 
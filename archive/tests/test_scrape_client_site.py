@@ -0,0 +1,95 @@
+"""Unit tests for the repository's scripts/scrape-client-site.py."""
+
+import asyncio
+import json
+
+import pytest
+
+from conftest import TOOLKIT_SCRIPTS_DIR, load_script
+
+# The script exits at import time without its scraping dependencies
+pytest.importorskip("playwright")
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("lxml")
+
+scs = load_script('scrape-client-site.py', TOOLKIT_SCRIPTS_DIR)
+
+IMAGE_BYTES = b"\x89PNG" + b"\0" * 1000
+
+
+def _image_urls(count):
+    return [f"https://example.com/img/photo{i}.png" for i in range(count)]
+
+
+@pytest.fixture
+def serve_images(monkeypatch):
+    """Route download_images() through a mock transport.
+
+    Returns the list of requested URLs; after fail_at requests the transport
+    raises KeyboardInterrupt, as if the run were interrupted.
+    """
+    requested = []
+    settings = {"fail_at": None}
+
+    def handler(request):
+        if len(requested) == settings["fail_at"]:
+            raise KeyboardInterrupt
+        requested.append(str(request.url))
+        return httpx.Response(200, content=IMAGE_BYTES)
+
+    real_client = httpx.AsyncClient
+
+    def client(**kwargs):
+        return real_client(transport=httpx.MockTransport(handler), **kwargs)
+
+    monkeypatch.setattr(scs.httpx, "AsyncClient", client)
+
+    def _serve(fail_at=None):
+        requested.clear()
+        settings["fail_at"] = fail_at
+        return requested
+    return _serve
+
+
+class TestImageManifest:
+    """Tests for image-manifest.json and reuse of earlier downloads."""
+
+    def test_manifest_lists_downloads(self, tmp_path, serve_images):
+        serve_images()
+        downloaded = asyncio.run(scs.download_images(_image_urls(3), tmp_path))
+        manifest = json.loads((tmp_path / "images" / "image-manifest.json").read_text())
+        assert sorted(manifest) == ["photo0.png", "photo1.png", "photo2.png"]
+        assert len(downloaded) == 3
+
+    def test_interrupted_run_is_resumed(self, tmp_path, serve_images):
+        """A rerun after an interruption should only fetch what is missing."""
+        urls = _image_urls(4)
+        serve_images()
+        asyncio.run(scs.download_images(urls[:2], tmp_path))
+
+        serve_images(fail_at=1)
+        with pytest.raises(KeyboardInterrupt):
+            asyncio.run(scs.download_images(urls[2:] + urls[:2], tmp_path))
+        manifest = json.loads((tmp_path / "images" / "image-manifest.json").read_text())
+        assert sorted(manifest) == ["photo0.png", "photo1.png", "photo2.png"]
+
+        requested = serve_images()
+        asyncio.run(scs.download_images(urls, tmp_path))
+        assert requested == [urls[3]]
+        assert sorted(p.name for p in (tmp_path / "images").glob("*.png")) == [
+            "photo0.png", "photo1.png", "photo2.png", "photo3.png"
+        ]
+
+    def test_truncated_manifest_is_recovered(self, tmp_path, serve_images):
+        """Whole lines of a manifest cut off mid-write should still be reused."""
+        urls = _image_urls(3)
+        serve_images()
+        asyncio.run(scs.download_images(urls, tmp_path))
+        manifest_path = tmp_path / "images" / "image-manifest.json"
+        text = manifest_path.read_text()
+        manifest_path.write_text(text[:text.rindex('"url"')])
+
+        requested = serve_images()
+        asyncio.run(scs.download_images(urls, tmp_path))
+        assert requested == [urls[2]]
+        assert not list((tmp_path / "images").glob("photo[01]_*.png"))
@@ -1,38 +1,21 @@
 """Unit tests for scripts/visual-diff.py."""
 
-import importlib.util
+import base64
+import io
 import os
 
 import pytest
 
 # Pillow is a required dependency; import unconditionally
-from PIL import Image
-
-
-# ---------------------------------------------------------------------------
-# Import the script module using importlib (handles hyphenated filename)
-# ---------------------------------------------------------------------------
-
-def load_script(name):
-    """Load a Python script from the scripts/ directory by filename."""
-    path = os.path.join(os.path.dirname(__file__), '..', 'scripts', name)
-    path = os.path.abspath(path)
-    module_name = name.replace('-', '_').replace('.py', '')
-    spec = importlib.util.spec_from_file_location(module_name, path)
-    module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(module)
-    return module
+from PIL import Image, features
 
+from conftest import load_script
 
 vd = load_script('visual-diff.py')
 
-# Check whether scikit-image is available (for SSIM tests)
-try:
-    import numpy as np
-    from skimage.metrics import structural_similarity as ssim
-    HAS_SKIMAGE = True
-except ImportError:
-    HAS_SKIMAGE = False
+# Whether scikit-image is available (for SSIM tests). The script only checks
+# that it is installed, so modules that never run SSIM skip the import.
+HAS_SKIMAGE = vd._HAS_SSIM
 
 skip_without_skimage = pytest.mark.skipif(
     not HAS_SKIMAGE,
@@ -40,6 +23,52 @@ skip_without_skimage = pytest.mark.skipif(
 )
 
 
+def _decoded(path):
+    """Open an image file and decode its pixels straight away."""
+    img = Image.open(path)
+    img.load()
+    return img
+
+
+# Sample images decoded once for the module. They are shared between tests,
+# so tests must treat them as read-only.
+
+@pytest.fixture(scope="module")
+def img_red(sample_image_red):
+    """The solid red 100x100 sample image."""
+    return _decoded(sample_image_red)
+
+
+@pytest.fixture(scope="module")
+def img_red_copy(sample_image_red_copy):
+    """A second, separately decoded solid red 100x100 image."""
+    return _decoded(sample_image_red_copy)
+
+
+@pytest.fixture(scope="module")
+def img_blue(sample_image_blue):
+    """The solid blue 100x100 sample image."""
+    return _decoded(sample_image_blue)
+
+
+@pytest.fixture(scope="module")
+def img_slightly_different(sample_image_slightly_different):
+    """The red 100x100 image with its top 5 rows blue."""
+    return _decoded(sample_image_slightly_different)
+
+
+@pytest.fixture(scope="module")
+def img_small(sample_image_small):
+    """The solid red 50x50 sample image."""
+    return _decoded(sample_image_small)
+
+
+@pytest.fixture
+def image_pair(request, img_red):
+    """(red, other) images; parametrize indirectly with the other img_ fixture's suffix."""
+    return img_red, request.getfixturevalue(f"img_{request.param}")
+
+
 # ---------------------------------------------------------------------------
 # Pixel similarity tests
 # ---------------------------------------------------------------------------
@@ -47,91 +76,198 @@ skip_without_skimage = pytest.mark.skipif(
 class TestPixelSimilarity:
     """Tests for pixel-level similarity calculation."""
 
-    def test_identical_images_100_percent(self, sample_image_red, sample_image_red_copy):
-        img1 = Image.open(sample_image_red)
-        img2 = Image.open(sample_image_red_copy)
-        similarity = vd.calculate_pixel_similarity(img1, img2)
-        assert similarity == 100.0, \
-            f"Identical images should have 100% pixel similarity, got {similarity}"
-
-    def test_completely_different_images_low_score(self, sample_image_red, sample_image_blue):
-        img1 = Image.open(sample_image_red)
-        img2 = Image.open(sample_image_blue)
-        similarity = vd.calculate_pixel_similarity(img1, img2)
-        assert similarity < 5.0, \
-            f"Red vs blue images should have very low similarity, got {similarity}%"
-
-    def test_slightly_different_images_high_score(self, sample_image_red, sample_image_slightly_different):
-        img1 = Image.open(sample_image_red)
-        img2 = Image.open(sample_image_slightly_different)
-        similarity = vd.calculate_pixel_similarity(img1, img2)
+    @pytest.mark.parametrize("image_pair,lo,hi", [
+        ("red_copy", 100.0, 100.0),
         # 95 of 100 rows are identical (95%), within tolerance
-        assert similarity > 90.0, \
-            f"Mostly-similar images should have >90% similarity, got {similarity}%"
-        assert similarity < 100.0, \
-            f"Slightly different images should not be 100%, got {similarity}%"
-
-    def test_similarity_returns_float(self, sample_image_red, sample_image_red_copy):
-        img1 = Image.open(sample_image_red)
-        img2 = Image.open(sample_image_red_copy)
-        result = vd.calculate_pixel_similarity(img1, img2)
+        ("slightly_different", 90.0, 99.0),
+        ("blue", 0.0, 1.0),
+    ], indirect=["image_pair"])
+    def test_similarity_range(self, image_pair, lo, hi):
+        similarity = vd.calculate_pixel_similarity(*image_pair)
+        assert lo <= similarity <= hi, \
+            f"Expected pixel similarity in [{lo}, {hi}]%, got {similarity}%"
+
+    def test_similarity_returns_float(self, img_red_copy):
+        buf = io.BytesIO()
+        Image.new("RGB", (100, 100), (255, 0, 0)).save(buf, "PNG")
+        buf.seek(0)
+        img1 = Image.open(buf)
+        result = vd.calculate_pixel_similarity(img1, img_red_copy)
         assert isinstance(result, float), f"Expected float, got {type(result)}"
 
+    def test_pure_python_fallback_matches(self, monkeypatch, img_red, img_slightly_different):
+        """The no-NumPy fallback should give the same score as the vectorized path."""
+        fast = vd.calculate_pixel_similarity(img_red, img_slightly_different)
+        monkeypatch.setattr(vd, "_HAS_NUMPY", False)
+        slow = vd.calculate_pixel_similarity(img_red, img_slightly_different)
+        assert fast == slow, f"NumPy path gave {fast}%, Pillow fallback gave {slow}%"
+
+    def test_uint8_numpy_path_matches_reference(self, monkeypatch):
+        """The all-uint8 NumPy path should agree with a widened int16 compare."""
+        np = pytest.importorskip("numpy")
+        monkeypatch.setattr(vd, "_HAS_NUMBA", False)
+        rng = np.random.default_rng(0)
+        a = rng.integers(0, 256, (40, 30, 3), dtype=np.uint8)
+        b = np.clip(a.astype(np.int16) + rng.integers(-15, 16, a.shape), 0, 255).astype(np.uint8)
+        diff = np.abs(a.astype(np.int16) - b.astype(np.int16))
+        expected = np.count_nonzero((diff <= vd.PIXEL_TOLERANCE).all(axis=2)) / (40 * 30) * 100
+        assert vd._pixel_similarity_arrays(a, b) == expected
+
+    def test_identical_arrays_skip_tolerance_compare(self, monkeypatch):
+        """Byte-equal arrays should score 100 without running the match kernel."""
+        np = pytest.importorskip("numpy")
+        monkeypatch.setattr(vd, "_HAS_NUMBA", True)
+        monkeypatch.setattr(vd, "_count_matching", lambda *a: pytest.fail("kernel was called"))
+        a = np.random.default_rng(0).integers(0, 256, (40, 30, 3), dtype=np.uint8)
+        assert vd._pixel_similarity_arrays(a, a.copy()) == 100.0
+
+    def test_sampled_similarity_close_and_repeatable(self, img_red, img_slightly_different):
+        """A fixed-seed sample should land near the full score every time."""
+        pytest.importorskip("numpy")
+        pair = (img_red, img_slightly_different)
+        full = vd.calculate_pixel_similarity(*pair)
+        sampled = vd.calculate_sampled_pixel_similarity(*pair, 5000)
+        assert sampled == vd.calculate_sampled_pixel_similarity(*pair, 5000)
+        assert abs(sampled - full) < 2.0, f"Sampled {sampled}% vs full {full}%"
+        # Asking for at least every pixel is just the full comparison
+        assert vd.calculate_sampled_pixel_similarity(*pair, 10000) == full
+
+    def test_numba_kernels_compile_only_on_request(self, monkeypatch):
+        """enable_numba() should wrap the kernels lazily, without compiling them."""
+        pytest.importorskip("numba")
+        for name in ("_HAS_NUMBA", "prange", "_count_matching", "_match_and_alpha",
+                     "_heatmap_pixels"):
+            monkeypatch.setattr(vd, name, getattr(vd, name))
+        monkeypatch.setattr(vd, "_HAS_NUMBA", False)
+        plain = vd._count_matching
+        assert vd.enable_numba()
+        assert vd._count_matching.py_func is plain
+        assert not vd._count_matching.signatures, "kernel compiled before its first call"
+
+    def test_match_kernel_counts_within_tolerance(self):
+        """The (optionally JIT-compiled) kernel should apply the per-channel tolerance."""
+        np = pytest.importorskip("numpy")
+        a = np.array([[0, 0, 0], [100, 100, 100], [255, 255, 255]], dtype=np.uint8)
+        b = np.array([[10, 10, 10], [100, 111, 100], [250, 255, 245]], dtype=np.uint8)
+        assert vd._count_matching(a, b, 10) == 2
+
+    def test_match_and_alpha_kernel_fills_highlight(self):
+        """The fused kernel should count matches and write the LUT alpha per pixel."""
+        np = pytest.importorskip("numpy")
+        a = np.array([[0, 0, 0], [100, 100, 100], [255, 255, 255]], dtype=np.uint8)
+        b = np.array([[10, 10, 10], [100, 140, 100], [250, 255, 245]], dtype=np.uint8)
+        alpha = np.empty(3, dtype=np.uint8)
+        assert vd._match_and_alpha(a, b, 10, vd.DIFF_HIGHLIGHT_THRESHOLD, alpha) == 2
+        assert alpha.tolist() == [0, 80, 0]
+
+
+class TestMseSimilarity:
+    """Tests for the downsampled-MSE similarity metric."""
+
+    def test_identical_images_100_percent(self, img_red, img_red_copy):
+        """Identical images should score exactly 100."""
+        assert vd.calculate_mse_similarity(img_red, img_red_copy) == 100.0
+
+    def test_completely_different_images_low_score(self, img_red, img_blue):
+        """Red vs blue saturates the MSE scale and scores 0."""
+        assert vd.calculate_mse_similarity(img_red, img_blue) == 0.0
+
+    def test_pure_python_fallback_matches(self, monkeypatch, img_red, img_slightly_different):
+        """The no-NumPy fallback should give the same score as the NumPy path."""
+        fast = vd.calculate_mse_similarity(img_red, img_slightly_different)
+        monkeypatch.setattr(vd, "_HAS_NUMPY", False)
+        slow = vd.calculate_mse_similarity(img_red, img_slightly_different)
+        assert fast == pytest.approx(slow)
+
 
 # ---------------------------------------------------------------------------
 # SSIM tests (require scikit-image)
 # ---------------------------------------------------------------------------
 
+@pytest.fixture(scope="module")
+def cached_ssim():
+    """calculate_ssim(img1, img2) memoized per pair of the module's shared images.
+
+    Keyed on object identity, which is stable because the img_* fixtures live
+    for the whole module.
+    """
+    results = {}
+
+    def _cached(img1, img2):
+        key = (id(img1), id(img2))
+        if key not in results:
+            results[key] = vd.calculate_ssim(img1, img2)
+        return results[key]
+    return _cached
+
+
+@pytest.fixture(scope="module")
+def ssim_identical(cached_ssim, img_red, img_red_copy):
+    """calculate_ssim() of the two red images, computed once for the module."""
+    return cached_ssim(img_red, img_red_copy)
+
+
 class TestSSIM:
     """Tests for SSIM (Structural Similarity Index) calculation."""
 
     @skip_without_skimage
-    def test_ssim_identical_images_score_1(self, sample_image_red, sample_image_red_copy):
-        img1 = Image.open(sample_image_red)
-        img2 = Image.open(sample_image_red_copy)
-        score, diff_map = vd.calculate_ssim(img1, img2)
-        assert abs(score - 1.0) < 0.001, \
+    def test_ssim_identical_images_score_1(self, ssim_identical):
+        score, diff_map = ssim_identical
+        assert score == pytest.approx(1.0, abs=1e-3), \
             f"SSIM of identical images should be ~1.0, got {score}"
 
     @skip_without_skimage
-    def test_ssim_slightly_different_above_09(self, sample_image_red, sample_image_slightly_different):
-        img1 = Image.open(sample_image_red)
-        img2 = Image.open(sample_image_slightly_different)
-        score, diff_map = vd.calculate_ssim(img1, img2)
-        assert score > 0.9, \
-            f"SSIM of slightly different images should be >0.9, got {score}"
+    def test_ssim_returns_tuple(self, ssim_identical):
+        assert isinstance(ssim_identical, tuple), f"Expected tuple, got {type(ssim_identical)}"
+        assert len(ssim_identical) == 2, \
+            f"Expected 2-tuple (score, diff_map), got {len(ssim_identical)}"
 
     @skip_without_skimage
-    def test_ssim_very_different_below_05(self, sample_image_red, sample_image_blue):
-        img1 = Image.open(sample_image_red)
-        img2 = Image.open(sample_image_blue)
-        score, diff_map = vd.calculate_ssim(img1, img2)
-        assert score < 0.5, \
-            f"SSIM of very different images should be <0.5, got {score}"
+    def test_ssim_diff_map_is_numpy_array(self, ssim_identical):
+        score, diff_map = ssim_identical
+        assert hasattr(diff_map, 'shape'), "diff_map should be a numpy array"
 
     @skip_without_skimage
-    def test_ssim_returns_tuple(self, sample_image_red, sample_image_red_copy):
-        img1 = Image.open(sample_image_red)
-        img2 = Image.open(sample_image_red_copy)
-        result = vd.calculate_ssim(img1, img2)
-        assert isinstance(result, tuple), f"Expected tuple, got {type(result)}"
-        assert len(result) == 2, f"Expected 2-tuple (score, diff_map), got {len(result)}"
+    @pytest.mark.parametrize("image_pair,lo,hi", [
+        ("slightly_different", 0.9, 1.0),
+        ("blue", -1.0, 0.5),
+    ], indirect=["image_pair"])
+    def test_ssim_score_range(self, cached_ssim, image_pair, lo, hi):
+        score, diff_map = cached_ssim(*image_pair)
+        assert lo <= score <= hi, f"Expected SSIM in [{lo}, {hi}], got {score}"
 
     @skip_without_skimage
-    def test_ssim_diff_map_is_numpy_array(self, sample_image_red, sample_image_blue):
-        img1 = Image.open(sample_image_red)
-        img2 = Image.open(sample_image_blue)
-        score, diff_map = vd.calculate_ssim(img1, img2)
-        assert hasattr(diff_map, 'shape'), "diff_map should be a numpy array"
+    def test_ssim_downscale_shrinks_diff_map(self, img_red, img_slightly_different):
+        score, diff_map = vd.calculate_ssim(img_red, img_slightly_different, downscale=2)
+        assert diff_map.shape[:2] == (50, 50), \
+            f"2x downscale of a 100x100 image should give a 50x50 map, got {diff_map.shape}"
+        assert score > 0.9, f"Downscaled SSIM should stay high, got {score}"
 
-    def test_ssim_raises_without_skimage(self, sample_image_red, sample_image_red_copy):
+    @skip_without_skimage
+    def test_ssim_luma_mode_single_channel(self, img_red, img_slightly_different):
+        score, diff_map = vd.calculate_ssim(img_red, img_slightly_different, mode="luma")
+        assert diff_map.shape == (100, 100), \
+            f"Luma SSIM should give a 2-D map, got {diff_map.shape}"
+        assert score > 0.9, f"Luma SSIM should stay high, got {score}"
+        assert vd.generate_ssim_heatmap(diff_map).size == (100, 100)
+
+    def test_heatmap_fused_kernel_matches_numpy(self, monkeypatch):
+        """The heatmap kernel should colour every pixel like the NumPy path."""
+        np = pytest.importorskip("numpy")
+        diff_map = np.random.default_rng(0).uniform(-0.2, 1.1, (20, 30, 3))
+        monkeypatch.setattr(vd, "_HAS_NUMBA", False)
+        plain = np.asarray(vd.generate_ssim_heatmap(diff_map))
+        # The uncompiled kernel runs the same loop enable_numba() would compile
+        monkeypatch.setattr(vd, "_HAS_NUMBA", True)
+        fused = np.asarray(vd.generate_ssim_heatmap(diff_map))
+        assert fused.shape == (20, 30, 3)
+        assert (fused == plain).all()
+
+    def test_ssim_raises_without_skimage(self, monkeypatch, img_red, img_red_copy):
         """If scikit-image is not available, calculate_ssim should raise RuntimeError."""
-        if HAS_SKIMAGE:
-            pytest.skip("scikit-image is installed; cannot test missing-dependency path")
-        img1 = Image.open(sample_image_red)
-        img2 = Image.open(sample_image_red_copy)
+        monkeypatch.setattr(vd, "_HAS_SSIM", False)
         with pytest.raises(RuntimeError, match="scikit-image"):
-            vd.calculate_ssim(img1, img2)
+            vd.calculate_ssim(img_red, img_red_copy)
 
 
 # ---------------------------------------------------------------------------
@@ -141,45 +277,27 @@ class TestSSIM:
 class TestRegionAnalysis:
     """Tests for region-based (horizontal band) similarity analysis."""
 
-    def test_divides_image_into_correct_number_of_regions(
-        self, sample_image_red, sample_image_red_copy
-    ):
-        img1 = Image.open(sample_image_red)
-        img2 = Image.open(sample_image_red_copy)
+    def test_divides_image_into_correct_number_of_regions(self, img_red, img_red_copy):
         num_regions = 4
-        regions = vd.calculate_region_scores(img1, img2, num_regions, metric="pixel")
+        regions = vd.calculate_region_scores(img_red, img_red_copy, num_regions, metric="pixel")
         assert len(regions) == num_regions, \
             f"Expected {num_regions} regions, got {len(regions)}"
 
-    def test_region_entries_have_expected_keys(
-        self, sample_image_red, sample_image_red_copy
-    ):
-        img1 = Image.open(sample_image_red)
-        img2 = Image.open(sample_image_red_copy)
-        regions = vd.calculate_region_scores(img1, img2, 3, metric="pixel")
-        for region in regions:
-            assert "label" in region, "Region entry missing 'label' key"
-            assert "score" in region, "Region entry missing 'score' key"
-            assert "metric" in region, "Region entry missing 'metric' key"
-
-    def test_identical_images_all_regions_100(
-        self, sample_image_red, sample_image_red_copy
-    ):
-        img1 = Image.open(sample_image_red)
-        img2 = Image.open(sample_image_red_copy)
-        regions = vd.calculate_region_scores(img1, img2, 4, metric="pixel")
-        for region in regions:
-            assert region["score"] == 100.0, \
-                f"Region '{region['label']}' should be 100% for identical images, got {region['score']}"
-
-    def test_top_region_detects_difference(
-        self, sample_image_red, sample_image_slightly_different
-    ):
+    def test_region_entries_have_expected_keys(self, img_red, img_red_copy):
+        regions = vd.calculate_region_scores(img_red, img_red_copy, 3, metric="pixel")
+        assert all({"label", "score", "metric"} <= region.keys() for region in regions), \
+            f"Region entries should have label, score and metric keys, got: {regions}"
+
+    def test_identical_images_all_regions_100(self, img_red, img_red_copy):
+        regions = vd.calculate_region_scores(img_red, img_red_copy, 4, metric="pixel")
+        scores = [region["score"] for region in regions]
+        assert scores == [100.0] * 4, \
+            f"All regions should be 100% for identical images, got {scores}"
+
+    def test_top_region_detects_difference(self, img_red, img_slightly_different):
         """The slightly-different image has blue pixels in top rows.
         The top region should have lower similarity than bottom regions."""
-        img1 = Image.open(sample_image_red)
-        img2 = Image.open(sample_image_slightly_different)
-        regions = vd.calculate_region_scores(img1, img2, 4, metric="pixel")
+        regions = vd.calculate_region_scores(img_red, img_slightly_different, 4, metric="pixel")
         # First region (top) covers rows 0-24, which includes the 5 different rows
         # Last region (bottom) should be 100% identical
         top_score = regions[0]["score"]
@@ -187,12 +305,8 @@ class TestRegionAnalysis:
         assert bottom_score > top_score, \
             f"Bottom region ({bottom_score}%) should have higher similarity than top ({top_score}%)"
 
-    def test_region_labels_include_top_and_bottom(
-        self, sample_image_red, sample_image_red_copy
-    ):
-        img1 = Image.open(sample_image_red)
-        img2 = Image.open(sample_image_red_copy)
-        regions = vd.calculate_region_scores(img1, img2, 4, metric="pixel")
+    def test_region_labels_include_top_and_bottom(self, img_red, img_red_copy):
+        regions = vd.calculate_region_scores(img_red, img_red_copy, 4, metric="pixel")
         labels = [r["label"] for r in regions]
         assert any("top" in label.lower() for label in labels), \
             f"Expected a region labeled with 'top', got: {labels}"
@@ -200,17 +314,33 @@ class TestRegionAnalysis:
             f"Expected a region labeled with 'bottom', got: {labels}"
 
     @skip_without_skimage
-    def test_region_analysis_with_ssim_metric(
-        self, sample_image_red, sample_image_red_copy
-    ):
-        img1 = Image.open(sample_image_red)
-        img2 = Image.open(sample_image_red_copy)
-        regions = vd.calculate_region_scores(img1, img2, 3, metric="ssim")
-        for region in regions:
-            assert region["metric"] == "ssim", \
-                f"Expected metric='ssim', got '{region['metric']}'"
-            assert abs(region["score"] - 1.0) < 0.001, \
-                f"SSIM for identical region should be ~1.0, got {region['score']}"
+    def test_region_analysis_with_ssim_metric(self, img_red, img_red_copy):
+        regions = vd.calculate_region_scores(img_red, img_red_copy, 3, metric="ssim")
+        metrics = [region["metric"] for region in regions]
+        assert metrics == ["ssim"] * 3, f"Expected metric='ssim' for every region, got {metrics}"
+        scores = [region["score"] for region in regions]
+        assert scores == pytest.approx([1.0] * 3, abs=1e-3), \
+            f"SSIM for identical regions should be ~1.0, got {scores}"
+
+    @skip_without_skimage
+    @pytest.mark.parametrize("height, metric", [(40, "ssim"), (20, "pixel")])
+    def test_region_ssim_on_short_images(self, height, metric):
+        """Bands shorter than the SSIM window should not raise."""
+        img = Image.new("RGB", (100, height), (200, 50, 50))
+        regions = vd.calculate_region_scores(img, img.copy(), 4, metric="ssim",
+                                             ssim_downscale=2)
+        assert [region["metric"] for region in regions] == [metric] * 4
+
+    def test_array_scores_match_image_scores(self, img_red, img_slightly_different):
+        """Scoring pre-converted arrays should match scoring the images."""
+        np = pytest.importorskip("numpy")
+        arr1, arr2 = np.asarray(img_red), np.asarray(img_slightly_different)
+        regions = vd._region_scores_arrays(arr1, arr2, 4)
+        assert regions == vd.calculate_region_scores(
+            img_red, img_slightly_different, 4, metric="pixel"
+        )
+        assert regions[0]["score"] < 100.0
+        assert [r["score"] for r in regions[1:]] == [100.0] * 3
 
 
 # ---------------------------------------------------------------------------
@@ -220,43 +350,28 @@ class TestRegionAnalysis:
 class TestThresholdLogic:
     """Tests for pass/fail threshold determination."""
 
-    def test_pixel_pass_above_threshold(self, sample_image_red, sample_image_red_copy):
-        img1 = Image.open(sample_image_red)
-        img2 = Image.open(sample_image_red_copy)
-        similarity = vd.calculate_pixel_similarity(img1, img2)
+    @pytest.mark.parametrize("image_pair,expected", [
+        ("red_copy", "pass"),
+        ("blue", "fail"),
+    ], indirect=["image_pair"])
+    def test_pixel_threshold(self, image_pair, expected):
+        similarity = vd.calculate_pixel_similarity(*image_pair)
         threshold = 95.0
         status = "pass" if similarity >= threshold else "fail"
-        assert status == "pass", \
-            f"100% similarity should pass threshold of {threshold}%"
-
-    def test_pixel_fail_below_threshold(self, sample_image_red, sample_image_blue):
-        img1 = Image.open(sample_image_red)
-        img2 = Image.open(sample_image_blue)
-        similarity = vd.calculate_pixel_similarity(img1, img2)
-        threshold = 95.0
-        status = "pass" if similarity >= threshold else "fail"
-        assert status == "fail", \
-            f"Very low similarity ({similarity}%) should fail threshold of {threshold}%"
+        assert status == expected, \
+            f"Similarity {similarity}% against threshold {threshold}% should {expected}"
 
     @skip_without_skimage
-    def test_ssim_pass_above_threshold(self, sample_image_red, sample_image_red_copy):
-        img1 = Image.open(sample_image_red)
-        img2 = Image.open(sample_image_red_copy)
-        score, _ = vd.calculate_ssim(img1, img2)
+    @pytest.mark.parametrize("image_pair,expected", [
+        ("red_copy", "pass"),
+        ("blue", "fail"),
+    ], indirect=["image_pair"])
+    def test_ssim_threshold(self, cached_ssim, image_pair, expected):
+        score, _ = cached_ssim(*image_pair)
         threshold = 0.95
         status = "pass" if score >= threshold else "fail"
-        assert status == "pass", \
-            f"SSIM {score} should pass threshold of {threshold}"
-
-    @skip_without_skimage
-    def test_ssim_fail_below_threshold(self, sample_image_red, sample_image_blue):
-        img1 = Image.open(sample_image_red)
-        img2 = Image.open(sample_image_blue)
-        score, _ = vd.calculate_ssim(img1, img2)
-        threshold = 0.95
-        status = "pass" if score >= threshold else "fail"
-        assert status == "fail", \
-            f"SSIM {score} should fail threshold of {threshold}"
+        assert status == expected, \
+            f"SSIM {score} against threshold {threshold} should {expected}"
 
 
 # ---------------------------------------------------------------------------
@@ -266,39 +381,25 @@ class TestThresholdLogic:
 class TestDifferentSizes:
     """Tests for handling images of different dimensions."""
 
-    def test_pixel_similarity_handles_different_sizes(
-        self, sample_image_red, sample_image_small
-    ):
-        """Should not crash when images have different dimensions."""
-        img1 = Image.open(sample_image_red)   # 100x100
-        img2 = Image.open(sample_image_small)  # 50x50
-        similarity = vd.calculate_pixel_similarity(img1, img2)
-        assert isinstance(similarity, float), "Should return a float"
-        # Both are red, so after resize they should be very similar
-        assert similarity > 90.0, \
-            f"Resized same-color images should be similar, got {similarity}%"
-
-    @skip_without_skimage
-    def test_ssim_handles_different_sizes(self, sample_image_red, sample_image_small):
-        """SSIM should handle images of different dimensions by resizing."""
-        img1 = Image.open(sample_image_red)   # 100x100
-        img2 = Image.open(sample_image_small)  # 50x50
-        score, diff_map = vd.calculate_ssim(img1, img2)
+    @pytest.mark.parametrize("score_fn,minimum", [
+        pytest.param(vd.calculate_pixel_similarity, 90.0, id="pixel"),
+        pytest.param(
+            lambda a, b: vd.calculate_ssim(a, b)[0], 0.9, id="ssim", marks=skip_without_skimage
+        ),
+    ])
+    def test_score_handles_different_sizes(self, img_red, img_small, score_fn, minimum):
+        """Scores should resize the clone to the original's dimensions."""
+        score = score_fn(img_red, img_small)
         assert isinstance(score, float), "Should return a float score"
-        # Both are red, so SSIM after resize should be very high
-        assert score > 0.9, \
-            f"Same-color images should have high SSIM after resize, got {score}"
+        # Both are red, so after resize they should be very similar
+        assert score > minimum, \
+            f"Resized same-color images should score above {minimum}, got {score}"
 
-    def test_region_analysis_handles_different_sizes(
-        self, sample_image_red, sample_image_small
-    ):
+    def test_region_analysis_handles_different_sizes(self, img_red, img_small):
         """Region analysis should handle images of different dimensions."""
-        img1 = Image.open(sample_image_red)   # 100x100
-        img2 = Image.open(sample_image_small)  # 50x50
-        regions = vd.calculate_region_scores(img1, img2, 4, metric="pixel")
+        regions = vd.calculate_region_scores(img_red, img_small, 4, metric="pixel")
         assert len(regions) == 4, f"Expected 4 regions, got {len(regions)}"
-        for region in regions:
-            assert isinstance(region["score"], float)
+        assert all(isinstance(region["score"], float) for region in regions)
 
 
 # ---------------------------------------------------------------------------
@@ -308,29 +409,268 @@ class TestDifferentSizes:
 class TestDiffImageGeneration:
     """Tests for visual diff image generation."""
 
-    def test_generate_diff_identical_images(self, sample_image_red, sample_image_red_copy):
+    def test_generate_diff_identical_images(self, img_red, img_red_copy):
         """Diff of identical images should produce an image with no red highlights."""
-        img1 = Image.open(sample_image_red)
-        img2 = Image.open(sample_image_red_copy)
-        diff = vd.generate_diff_image(img1, img2)
+        diff = vd.generate_diff_image(img_red, img_red_copy)
         assert isinstance(diff, Image.Image), "Should return a PIL Image"
-        assert diff.size == img1.size, "Diff image should match input dimensions"
+        assert diff.size == img_red.size, "Diff image should match input dimensions"
 
-    def test_generate_diff_different_images(self, sample_image_red, sample_image_blue):
+    def test_generate_diff_different_images(self, img_red, img_blue):
         """Diff of very different images should produce a non-empty diff."""
-        img1 = Image.open(sample_image_red)
-        img2 = Image.open(sample_image_blue)
-        diff = vd.generate_diff_image(img1, img2)
+        diff = vd.generate_diff_image(img_red, img_blue)
         assert isinstance(diff, Image.Image), "Should return a PIL Image"
-        assert diff.size == img1.size, "Diff image should match input dimensions"
+        assert diff.size == img_red.size, "Diff image should match input dimensions"
 
-    def test_generate_diff_handles_different_sizes(
-        self, sample_image_red, sample_image_small
-    ):
+    def test_generate_diff_handles_different_sizes(self, img_red, img_small):
         """Diff should handle images of different sizes."""
-        img1 = Image.open(sample_image_red)   # 100x100
-        img2 = Image.open(sample_image_small)  # 50x50
-        diff = vd.generate_diff_image(img1, img2)
+        diff = vd.generate_diff_image(img_red, img_small)
         assert isinstance(diff, Image.Image), "Should return a PIL Image"
-        # Output should match img1 size (the reference)
-        assert diff.size == img1.size
+        # Output should match img_red size (the reference)
+        assert diff.size == img_red.size
+
+    def test_compare_identical_images_has_no_diff(self, img_red, img_red_copy):
+        """compare() should skip the diff image when every pixel matches."""
+        similarity, diff = vd.compare(img_red, img_red_copy)
+        assert similarity == 100.0
+        assert diff is None, "Identical images should not produce a diff image"
+
+    def test_compare_matches_separate_passes(self, img_red, img_blue):
+        """compare() should agree with calculate_similarity and generate_diff_image."""
+        similarity, diff = vd.compare(img_red, img_blue)
+        assert similarity == vd.calculate_similarity(img_red, img_blue)
+        assert diff.tobytes() == vd.generate_diff_image(img_red, img_blue).tobytes()
+
+    def test_compare_uses_numpy_unless_numba_enabled(
+        self, monkeypatch, img_red, img_slightly_different
+    ):
+        """The default compare() path should not touch the Numba kernel, and the
+        kernel path should give the same result when it is enabled."""
+        pytest.importorskip("numpy")
+        plain_kernel = vd._match_and_alpha
+        monkeypatch.setattr(vd, "_HAS_NUMBA", False)
+        monkeypatch.setattr(vd, "_match_and_alpha", lambda *a: pytest.fail("kernel was called"))
+        similarity, diff = vd.compare(img_red, img_slightly_different)
+        # The uncompiled kernel runs the same loop Numba would compile
+        monkeypatch.setattr(vd, "_HAS_NUMBA", True)
+        monkeypatch.setattr(vd, "_match_and_alpha", plain_kernel)
+        kernel_similarity, kernel_diff = vd.compare(img_red, img_slightly_different)
+        assert kernel_similarity == similarity
+        assert kernel_diff.tobytes() == diff.tobytes()
+
+
+# ---------------------------------------------------------------------------
+# Screenshot loading tests
+# ---------------------------------------------------------------------------
+
+class TestLoadScreenshot:
+    """Tests for downscaling screenshots before comparison."""
+
+    def test_wide_image_capped_to_max_width(self, sample_image_red):
+        """Images wider than max_width should be scaled down, keeping aspect ratio."""
+        img = vd.load_screenshot(sample_image_red, max_width=40)
+        assert img.size == (40, 40)
+
+    def test_tall_page_capped_by_width_only(self, make_solid_png):
+        """Full-page captures keep their aspect ratio; height is never the limit."""
+        tall = make_solid_png("tall.png", 100, 400, 255, 255, 255)
+        assert vd.load_screenshot(tall, max_width=50).size == (50, 200)
+
+    def test_narrow_image_left_alone(self, sample_image_red):
+        """Images within max_width, or with no cap, keep their original size."""
+        assert vd.load_screenshot(sample_image_red, max_width=1024).size == (100, 100)
+        assert vd.load_screenshot(sample_image_red).size == (100, 100)
+
+
+# ---------------------------------------------------------------------------
+# Pair processing tests
+# ---------------------------------------------------------------------------
+
+class TestProcessPair:
+    """Tests for comparing a single original/clone pair end to end."""
+
+    @pytest.fixture
+    def report_dir(self, tmp_path):
+        out = tmp_path / "report"
+        for sub in ("originals", "clones", "diffs", "heatmaps"):
+            (out / sub).mkdir(parents=True)
+        return out
+
+    def test_identical_files_skip_decoding(
+        self, monkeypatch, report_dir, sample_image_red, sample_image_red_copy
+    ):
+        """Byte-identical files should pass without running any comparison."""
+        monkeypatch.setattr(vd, "compare", lambda *a: pytest.fail("compare() was called"))
+        entry, _ = vd.process_pair(
+            sample_image_red, sample_image_red_copy, report_dir, "pixel", 95.0, 4
+        )
+        assert entry["status"] == "pass"
+        assert entry["similarity"] == 100.0
+        assert [r["score"] for r in entry["regions"]] == [100.0] * 4
+        assert "diff_rel" not in entry
+
+    def test_pixel_identical_files_skip_metrics(
+        self, monkeypatch, report_dir, sample_image_red, tmp_path
+    ):
+        """Different encodings of the same pixels should pass without any metric."""
+        reencoded = tmp_path / "red.bmp"
+        Image.open(sample_image_red).save(reencoded)
+        monkeypatch.setattr(vd, "compare", lambda *a: pytest.fail("compare() was called"))
+        monkeypatch.setattr(vd, "calculate_ssim", lambda *a: pytest.fail("SSIM was called"))
+        entry, _ = vd.process_pair(sample_image_red, reencoded, report_dir, "ssim", 0.95, 1)
+        assert entry["status"] == "pass"
+        assert entry["similarity"] == 100.0
+        assert entry["thumbnail"].startswith("data:image/")
+        assert "heatmap_rel" not in entry
+
+    def test_different_files_write_diff(self, report_dir, sample_image_red, sample_image_blue):
+        """Differing files should fail the threshold and produce a diff image."""
+        entry, _ = vd.process_pair(
+            sample_image_red, sample_image_blue, report_dir, "pixel", 95.0, 4
+        )
+        assert entry["status"] == "fail"
+        assert (report_dir / entry["diff_rel"]).exists()
+
+    def test_passing_pair_skips_diff_unless_diff_all(
+        self, report_dir, sample_image_red, sample_image_slightly_different
+    ):
+        """A pair that differs but passes the threshold only gets a diff with diff_all."""
+        args = (sample_image_red, sample_image_slightly_different, report_dir, "pixel", 50.0, 1)
+        entry, _ = vd.process_pair(*args)
+        assert entry["status"] == "pass"
+        assert "diff_rel" not in entry
+
+        entry, _ = vd.process_pair(*args, diff_all=True)
+        assert (report_dir / entry["diff_rel"]).exists()
+
+
+# ---------------------------------------------------------------------------
+# Report file placement tests
+# ---------------------------------------------------------------------------
+
+class TestPlaceFile:
+    """Tests for linking or copying screenshots into the report directory."""
+
+    @pytest.mark.parametrize("link_mode", ["copy", "hardlink", "symlink"])
+    def test_places_file_contents(self, tmp_path, sample_image_red, link_mode):
+        """Every mode should leave a readable file with the source contents."""
+        dst = tmp_path / "placed.png"
+        vd.place_file(sample_image_red, dst, link_mode)
+        assert dst.read_bytes() == sample_image_red.read_bytes()
+
+    def test_symlink_is_relative(self, tmp_path, sample_image_red):
+        """Symlinks should survive moving the report alongside its sources."""
+        dst = tmp_path / "placed.png"
+        vd.place_file(sample_image_red, dst, "symlink")
+        if not dst.is_symlink():
+            pytest.skip("Filesystem refused the symlink")
+        assert not os.path.isabs(os.readlink(dst))
+
+    def test_reference_mode_writes_nothing(self, tmp_path, sample_image_red):
+        """'reference' should point at the source instead of placing a file."""
+        report_dir = tmp_path / "report"
+        report_dir.mkdir()
+        dst = report_dir / "originals" / "red.png"
+        rel = vd.report_asset(sample_image_red, dst, report_dir, "reference")
+        assert not dst.exists()
+        assert (report_dir / rel).resolve() == sample_image_red.resolve()
+
+    @pytest.mark.parametrize("link_mode", ["copy", "hardlink", "symlink"])
+    def test_rerun_over_existing_link(self, tmp_path, sample_image_red, link_mode):
+        """Placing again over a hardlink to src should leave both files intact."""
+        src = tmp_path / "red.png"
+        src.write_bytes(sample_image_red.read_bytes())
+        dst = tmp_path / "placed.png"
+        os.link(src, dst)
+        vd.place_file(src, dst, link_mode)
+        assert src.read_bytes() == dst.read_bytes() == sample_image_red.read_bytes()
+        assert os.path.samefile(src, dst)
+
+    @pytest.mark.parametrize("link_mode", ["copy", "hardlink", "symlink"])
+    def test_source_inside_report_is_kept(self, tmp_path, sample_image_red, link_mode):
+        """Rerunning against the report's own originals/ must not delete them."""
+        src = tmp_path / "red.png"
+        src.write_bytes(sample_image_red.read_bytes())
+        vd.place_file(src, src, link_mode)
+        assert src.read_bytes() == sample_image_red.read_bytes()
+        assert list(tmp_path.iterdir()) == [src]
+
+    def test_replaces_stale_file(self, tmp_path, sample_image_red, sample_image_blue):
+        """A different file left by a previous run should be overwritten."""
+        dst = tmp_path / "placed.png"
+        dst.write_bytes(sample_image_blue.read_bytes())
+        vd.place_file(sample_image_red, dst, "copy")
+        assert dst.read_bytes() == sample_image_red.read_bytes()
+        assert list(tmp_path.iterdir()) == [dst]
+
+
+# ---------------------------------------------------------------------------
+# HTML report tests
+# ---------------------------------------------------------------------------
+
+class TestHtmlReport:
+    """Tests for the generated HTML report."""
+
+    def test_page_names_are_escaped(self, tmp_path):
+        """Page names come from filenames and must not inject markup."""
+        results = [{"name": "<script>x</script>", "status": "missing", "similarity": "N/A"}]
+        report = vd.generate_html_report(results, tmp_path, metric="pixel")
+        content = report.read_text(encoding="utf-8")
+        assert "<script>" not in content
+        assert "&lt;script&gt;x&lt;/script&gt;" in content
+        assert content.rstrip().endswith("</html>")
+
+    def test_streamed_results_keep_pair_order(self, tmp_path):
+        """Results added out of order should give the same report as in order."""
+        results = [
+            {"name": f"page{i}", "status": "pass", "similarity": 99.0 - i}
+            for i in range(4)
+        ]
+        in_order = vd.generate_html_report(results, tmp_path).read_text(encoding="utf-8")
+
+        writer = vd.HtmlReportWriter(tmp_path)
+        for index in (2, 0, 3, 1):
+            writer.add(index, results[index])
+        streamed = writer.close().read_text(encoding="utf-8")
+        assert streamed == in_order
+        assert list(tmp_path.iterdir()) == [tmp_path / "index.html"]
+
+    @pytest.mark.parametrize("webp,mime", [(True, "image/webp"), (False, "image/jpeg")])
+    def test_thumbnail_is_small_inline_image(self, monkeypatch, webp, mime):
+        """Previews are data: URIs that fit the thumbnail box, even for tall pages.
+
+        Pillow builds without WebP support fall back to JPEG.
+        """
+        if webp and not features.check("webp"):
+            pytest.skip("Pillow was built without WebP support")
+        monkeypatch.setattr(vd, "_THUMBNAIL_WEBP", webp)
+        uri = vd.make_thumbnail_uri(Image.new("RGB", (1024, 6000), (255, 0, 0)))
+        prefix = f"data:{mime};base64,"
+        assert uri.startswith(prefix)
+        thumb = Image.open(io.BytesIO(base64.b64decode(uri[len(prefix):])))
+        assert thumb.size == vd.THUMBNAIL_SIZE
+
+
+# ---------------------------------------------------------------------------
+# Screenshot matching tests
+# ---------------------------------------------------------------------------
+
+class TestMatchScreenshots:
+    """Tests for pairing original and clone screenshots by filename."""
+
+    def test_pairs_by_stem_and_reports_missing(self, tmp_path):
+        """Matched stems pair up; unmatched files on either side pair with None."""
+        orig, clone = tmp_path / "orig", tmp_path / "clone"
+        orig.mkdir()
+        clone.mkdir()
+        for name in ("home.png", "about.JPG", "notes.txt", ".png"):
+            (orig / name).write_bytes(b"")
+        for name in ("home.png", "about.jpg", "contact.webp"):
+            (clone / name).write_bytes(b"")
+
+        pairs = vd.match_screenshots(orig, clone)
+        named = [(o and o.name, c and c.name) for o, c in pairs]
+        assert named == [
+            ("about.JPG", "about.jpg"),
+            ("home.png", "home.png"),
+            (None, "contact.webp"),
+        ]
@@ -28,7 +28,7 @@ import re
 import sys
 import time
 from pathlib import Path
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin, urlparse, urlsplit
 
 try:
     from playwright.async_api import async_playwright
@@ -48,6 +48,13 @@ except ImportError:
     print("Error: httpx is required. Install with: pip install httpx")
     sys.exit(1)
 
+try:
+    import lxml.html
+    from lxml.etree import ParserError
+except ImportError:
+    print("Error: lxml is required. Install with: pip install lxml")
+    sys.exit(1)
+
 
 # ---------------------------------------------------------------------------
 # Output schema
@@ -144,14 +151,49 @@ def detect_platform(html: str, url: str) -> str:
     return "other"
 
 
+# ---------------------------------------------------------------------------
+# Single-pass element collection
+# ---------------------------------------------------------------------------
+
+def collect_elements(soup: BeautifulSoup) -> dict[str, list]:
+    """Bucket the elements the extractors look up by tag in one DOM walk.
+
+    Several extractors scan the whole tree for the same few element kinds
+    (images, anchors, JSON-LD scripts, inline background styles).  Walking
+    once and handing the buckets to each of them avoids a full traversal
+    per extractor.  Keys: img, wix-image, a (with href), jsonld, background,
+    logo-id (elements whose id mentions "logo").
+    """
+    collected = {"img": [], "wix-image": [], "a": [], "jsonld": [], "background": [], "logo-id": []}
+    for elem in soup.find_all(True):
+        name = elem.name
+        if name == "img" or name == "wix-image":
+            collected[name].append(elem)
+        elif name == "a":
+            if elem.has_attr("href"):
+                collected["a"].append(elem)
+        elif name == "script":
+            if elem.get("type") == "application/ld+json":
+                collected["jsonld"].append(elem)
+        style = elem.get("style")
+        if style and "background" in style:
+            collected["background"].append(elem)
+        elem_id = elem.get("id")
+        if elem_id and "logo" in elem_id.lower():
+            collected["logo-id"].append(elem)
+    return collected
+
+
 # ---------------------------------------------------------------------------
 # Schema.org JSON-LD extraction
 # ---------------------------------------------------------------------------
 
-def extract_jsonld(soup: BeautifulSoup) -> list[dict]:
+def extract_jsonld(soup: BeautifulSoup, collected: dict | None = None) -> list[dict]:
     """Parse all JSON-LD blocks from the page into a flat list of objects."""
+    if collected is None:
+        collected = collect_elements(soup)
     results = []
-    for script in soup.find_all("script", type="application/ld+json"):
+    for script in collected["jsonld"]:
         try:
             data = json.loads(script.string)
             if isinstance(data, list):
@@ -274,7 +316,8 @@ def extract_description(soup: BeautifulSoup, jsonld: list[dict]) -> str:
     return ""
 
 
-def extract_phone(soup: BeautifulSoup, jsonld: list[dict], html: str) -> str:
+def extract_phone(soup: BeautifulSoup, jsonld: list[dict], html: str,
+                  collected: dict | None = None) -> str:
     """Find a phone number from JSON-LD, links, and text patterns."""
     # JSON-LD
     biz = find_jsonld_by_type(jsonld, [
@@ -287,9 +330,11 @@ def extract_phone(soup: BeautifulSoup, jsonld: list[dict], html: str) -> str:
             return clean_text(phone)
 
     # tel: links
-    tel_link = soup.find("a", href=re.compile(r"^tel:", re.I))
-    if tel_link:
-        return tel_link["href"].replace("tel:", "").strip()
+    if collected is None:
+        collected = collect_elements(soup)
+    for link in collected["a"]:
+        if link["href"][:4].lower() == "tel:":
+            return link["href"].replace("tel:", "").strip()
 
     # Regex fallback
     phone_pattern = re.compile(r"(\+?1?[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4})")
@@ -299,7 +344,8 @@ def extract_phone(soup: BeautifulSoup, jsonld: list[dict], html: str) -> str:
     return ""
 
 
-def extract_email(soup: BeautifulSoup, jsonld: list[dict], html: str) -> str:
+def extract_email(soup: BeautifulSoup, jsonld: list[dict], html: str,
+                  collected: dict | None = None) -> str:
     """Find an email address from JSON-LD, mailto links, or text patterns."""
     # JSON-LD
     biz = find_jsonld_by_type(jsonld, [
@@ -311,9 +357,11 @@ def extract_email(soup: BeautifulSoup, jsonld: list[dict], html: str) -> str:
         if email:
             return clean_text(email)
 
-    mailto = soup.find("a", href=re.compile(r"^mailto:", re.I))
-    if mailto:
-        return mailto["href"].replace("mailto:", "").split("?")[0].strip()
+    if collected is None:
+        collected = collect_elements(soup)
+    for link in collected["a"]:
+        if link["href"][:7].lower() == "mailto:":
+            return link["href"].replace("mailto:", "").split("?")[0].strip()
 
     email_pattern = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
     match = email_pattern.search(html)
@@ -397,7 +445,8 @@ def extract_hours(soup: BeautifulSoup, jsonld: list[dict]) -> list[dict]:
     return hours
 
 
-def extract_social_links(soup: BeautifulSoup, jsonld: list[dict]) -> dict:
+def extract_social_links(soup: BeautifulSoup, jsonld: list[dict],
+                         collected: dict | None = None) -> dict:
     """Extract social media URLs from JSON-LD and anchor tags."""
     socials = {"facebook": "", "instagram": "", "youtube": "", "tiktok": "", "linkedin": ""}
 
@@ -431,7 +480,9 @@ def extract_social_links(soup: BeautifulSoup, jsonld: list[dict]) -> dict:
         "tiktok": r"tiktok\.com",
         "linkedin": r"linkedin\.com",
     }
-    for link in soup.find_all("a", href=True):
+    if collected is None:
+        collected = collect_elements(soup)
+    for link in collected["a"]:
         href = link["href"]
         for platform, pattern in platform_patterns.items():
             if re.search(pattern, href, re.I) and not socials[platform]:
@@ -440,7 +491,8 @@ def extract_social_links(soup: BeautifulSoup, jsonld: list[dict]) -> dict:
     return socials
 
 
-def extract_logo_url(soup: BeautifulSoup, jsonld: list[dict], base_url: str) -> str:
+def extract_logo_url(soup: BeautifulSoup, jsonld: list[dict], base_url: str,
+                     collected: dict | None = None) -> str:
     """Find the site logo URL."""
     # JSON-LD logo
     biz = find_jsonld_by_type(jsonld, [
@@ -455,7 +507,9 @@ def extract_logo_url(soup: BeautifulSoup, jsonld: list[dict], base_url: str) ->
             return urljoin(base_url, logo)
 
     # img with logo-like attributes
-    for img in soup.find_all("img"):
+    if collected is None:
+        collected = collect_elements(soup)
+    for img in collected["img"]:
         alt = (img.get("alt") or "").lower()
         src = img.get("src") or img.get("data-src") or ""
         classes = " ".join(img.get("class", []))
@@ -469,7 +523,7 @@ def extract_logo_url(soup: BeautifulSoup, jsonld: list[dict], base_url: str) ->
             return urljoin(base_url, src) if src else ""
 
     # Wix-specific logo by ID
-    for elem in soup.find_all(attrs={"id": re.compile(r"logo", re.I)}):
+    for elem in collected["logo-id"]:
         img = elem.find("img")
         if img:
             src = img.get("src") or img.get("data-src") or ""
@@ -488,7 +542,7 @@ def extract_logo_url(soup: BeautifulSoup, jsonld: list[dict], base_url: str) ->
     return ""
 
 
-def extract_hero_image(soup: BeautifulSoup, base_url: str) -> str:
+def extract_hero_image(soup: BeautifulSoup, base_url: str, collected: dict | None = None) -> str:
     """Find the hero/banner image URL."""
     # Hero section images
     for selector in ["[class*='hero']", "[class*='banner']", "[class*='Hero']", "[class*='Banner']"]:
@@ -506,7 +560,9 @@ def extract_hero_image(soup: BeautifulSoup, base_url: str) -> str:
                 return urljoin(base_url, bg_match.group(1))
 
     # First large image on page as fallback
-    for img in soup.find_all("img"):
+    if collected is None:
+        collected = collect_elements(soup)
+    for img in collected["img"]:
         src = img.get("src") or img.get("data-src") or ""
         if not src or "logo" in src.lower():
             continue
@@ -768,11 +824,13 @@ def _get_element_context(elem) -> str:
     return ""
 
 
-def collect_all_images(soup: BeautifulSoup, base_url: str) -> list[dict]:
+def collect_all_images(soup: BeautifulSoup, base_url: str, collected: dict | None = None) -> list[dict]:
     """Collect all meaningful images from the page with metadata.
 
     Returns a list of dicts with keys: url, alt, context, width, height, tag.
     """
+    if collected is None:
+        collected = collect_elements(soup)
     seen_urls = set()
     images = []
 
@@ -800,7 +858,7 @@ def collect_all_images(soup: BeautifulSoup, base_url: str) -> list[dict]:
             "tag": "",
         })
 
-    for img in soup.find_all("img"):
+    for img in collected["img"]:
         src = img.get("src") or img.get("data-src") or ""
         if not src:
             continue
@@ -819,14 +877,14 @@ def collect_all_images(soup: BeautifulSoup, base_url: str) -> list[dict]:
         _add_image(full_url, alt=alt, context=context, width=str(w), height=str(h))
 
     # Also check wix-image custom elements
-    for wimg in soup.find_all("wix-image"):
+    for wimg in collected["wix-image"]:
         src = wimg.get("data-src") or wimg.get("src") or ""
         if src:
             alt = wimg.get("alt", "") or ""
             _add_image(urljoin(base_url, src), alt=alt, context="wix-image")
 
     # Background images in style attributes
-    for elem in soup.find_all(style=re.compile(r"background")):
+    for elem in collected["background"]:
         style = elem.get("style", "")
         bg_match = re.search(r'url\(["\']?(.*?)["\']?\)', style)
         if bg_match:
@@ -842,6 +900,54 @@ def collect_all_images(soup: BeautifulSoup, base_url: str) -> list[dict]:
 # Image downloader
 # ---------------------------------------------------------------------------
 
+_FILENAME_UNSAFE_RE = re.compile(r"[^\w.\-]")
+_IMAGE_EXT_RE = re.compile(r"\.(jpg|jpeg|png|gif|webp|avif|svg)$", re.I)
+
+
+def _derive_filename(url: str, i: int) -> str:
+    """Derive a filesystem-safe local filename from an image URL."""
+    tail = urlsplit(url).path.rstrip("/").rpartition("/")[2]
+    filename = _FILENAME_UNSAFE_RE.sub("_", tail) if tail else f"image_{i}"
+    if not _IMAGE_EXT_RE.search(filename):
+        filename += ".jpg"
+    return filename
+
+
+def _manifest_entry(url: str, item: dict) -> dict:
+    """Build the image-manifest.json record for a downloaded image."""
+    return {
+        "url": url,
+        "alt": item.get("alt", ""),
+        "context": item.get("context", ""),
+        "width": item.get("width", 0),
+        "height": item.get("height", 0),
+        "tag": item.get("tag", ""),
+    }
+
+
+def _read_manifest(manifest_path: Path) -> dict:
+    """Load image-manifest.json, recovering the entries of a truncated one.
+
+    The manifest is written one entry per line, so when a killed run left it
+    unterminated every complete line is still usable.
+    """
+    text = manifest_path.read_text(encoding="utf-8")
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        pass
+    entries = {}
+    for line in text.splitlines():
+        line = line.strip().rstrip(",")
+        if not line.startswith('"'):
+            continue
+        try:
+            entries.update(json.loads("{" + line + "}"))
+        except json.JSONDecodeError:
+            continue
+    return entries
+
+
 async def download_images(image_list: list, output_dir: Path) -> list[str]:
     """Download images to output_dir/images/ and return list of local paths.
 
@@ -852,64 +958,113 @@ async def download_images(image_list: list, output_dir: Path) -> list[str]:
     images_dir = output_dir / "images"
     images_dir.mkdir(parents=True, exist_ok=True)
 
-    # Normalize to list of dicts
-    items: list[dict] = []
+    # Normalize to list of dicts, one per URL.  Sites often repeat the same
+    # image (logo in header and footer, hero reused across sections); later
+    # occurrences only fill in metadata the first one was missing.
+    by_url: dict[str, dict] = {}
     for entry in image_list:
         if isinstance(entry, str):
-            items.append({"url": entry, "alt": "", "context": "", "width": 0, "height": 0, "tag": ""})
-        elif isinstance(entry, dict):
-            items.append(entry)
+            entry = {"url": entry, "alt": "", "context": "", "width": 0, "height": 0, "tag": ""}
+        elif not isinstance(entry, dict):
+            continue
+        url = entry.get("url", "")
+        if not url:
+            continue
+        first = by_url.get(url)
+        if first is None:
+            by_url[url] = dict(entry)
+            continue
+        for key, value in entry.items():
+            if value and not first.get(key):
+                first[key] = value
+    items = list(by_url.values())
+
+    # Reuse files a previous run already downloaded into this directory
+    manifest_path = images_dir / "image-manifest.json"
+    previous: dict[str, tuple[str, dict]] = {}
+    if manifest_path.exists():
+        try:
+            for local_name, meta in _read_manifest(manifest_path).items():
+                if meta.get("url") and (images_dir / local_name).exists():
+                    previous[meta["url"]] = (local_name, meta)
+        except (OSError, UnicodeDecodeError, AttributeError):
+            previous = {}
 
     downloaded = []
-    manifest: dict[str, dict] = {}
+    manifest_count = 0
+
+    # The manifest is streamed entry-by-entry as images land, so it never has
+    # to be held in memory.  An interrupted run still closes it, keeping the
+    # previous run's entries it had not reached yet, and a killed one leaves
+    # whole lines that _read_manifest() recovers.
+    with open(manifest_path, "w", encoding="utf-8", buffering=256 * 1024) as manifest_file:
+        manifest_file.write("{")
+
+        def write_entry(local_name: str, entry: dict):
+            nonlocal manifest_count
+            manifest_file.write(
+                f'{"," if manifest_count else ""}\n  {json.dumps(local_name, ensure_ascii=False)}: '
+                f"{json.dumps(entry, ensure_ascii=False)}"
+            )
+            manifest_count += 1
 
-    async with httpx.AsyncClient(follow_redirects=True, timeout=30.0) as client:
-        for i, item in enumerate(items):
-            url = item.get("url", "")
-            if not url:
-                continue
-            try:
-                # Derive filename from URL
-                parsed = urlparse(url)
-                path_parts = parsed.path.rstrip("/").split("/")
-                filename = path_parts[-1] if path_parts[-1] else f"image_{i}"
-
-                # Clean filename
-                filename = re.sub(r'[^\w.\-]', '_', filename)
-                if not re.search(r'\.(jpg|jpeg|png|gif|webp|avif|svg)$', filename, re.I):
-                    filename += ".jpg"
-
-                # Avoid duplicates
-                dest = images_dir / filename
-                if dest.exists():
-                    base, ext = dest.stem, dest.suffix
-                    dest = images_dir / f"{base}_{i}{ext}"
-
-                response = await client.get(url)
-                if response.status_code == 200 and len(response.content) > 500:
-                    dest.write_bytes(response.content)
-                    local_name = dest.name
-                    downloaded.append(str(dest.relative_to(output_dir)))
-
-                    manifest[local_name] = {
-                        "url": url,
-                        "alt": item.get("alt", ""),
-                        "context": item.get("context", ""),
-                        "width": item.get("width", 0),
-                        "height": item.get("height", 0),
-                        "tag": item.get("tag", ""),
-                    }
-
-                    if (i + 1) % 10 == 0:
-                        print(f"     Downloaded {i + 1}/{len(items)} images...")
-            except Exception:
-                continue
+        def add_to_manifest(dest: Path, url: str, item: dict):
+            downloaded.append(str(dest.relative_to(output_dir)))
+            write_entry(dest.name, _manifest_entry(url, item))
 
-    # Write image manifest
-    manifest_path = images_dir / "image-manifest.json"
-    with open(manifest_path, "w", encoding="utf-8") as f:
-        json.dump(manifest, f, indent=2, ensure_ascii=False)
-    print_step(f"Wrote image manifest ({len(manifest)} entries) to {manifest_path}")
+        try:
+            async with httpx.AsyncClient(follow_redirects=True, timeout=30.0) as client:
+                for i, item in enumerate(items):
+                    url = item.get("url", "")
+                    if not url:
+                        continue
+                    partial: Path | None = None
+                    if url in previous:
+                        add_to_manifest(images_dir / previous.pop(url)[0], url, item)
+                        continue
+                    try:
+                        # Avoid duplicates
+                        dest = images_dir / _derive_filename(url, i)
+                        if dest.exists():
+                            base, ext = dest.stem, dest.suffix
+                            dest = images_dir / f"{base}_{i}{ext}"
+
+                        # Stream the body straight to disk rather than buffering it
+                        async with client.stream("GET", url) as response:
+                            if response.status_code != 200:
+                                continue
+                            total = 0
+                            partial = dest
+                            with dest.open("wb") as f:
+                                async for chunk in response.aiter_bytes(64 * 1024):
+                                    f.write(chunk)
+                                    total += len(chunk)
+
+                        # Too small to be a real image (tracking pixel, error stub)
+                        partial = None
+                        if total <= 500:
+                            dest.unlink(missing_ok=True)
+                            continue
+
+                        add_to_manifest(dest, url, item)
+
+                        if (i + 1) % 10 == 0:
+                            print(f"     Downloaded {i + 1}/{len(items)} images...")
+                    except Exception:
+                        continue
+                    finally:
+                        # Drop any partially written file from an interrupted stream
+                        if partial is not None:
+                            partial.unlink(missing_ok=True)
+            # Finished: entries for images the site no longer uses are dropped
+            previous.clear()
+        finally:
+            # An interrupted run keeps the earlier downloads it never reached,
+            # and the object is closed either way
+            for local_name, meta in previous.values():
+                write_entry(local_name, meta)
+            manifest_file.write("\n}\n")
+    print_step(f"Wrote image manifest ({manifest_count} entries) to {manifest_path}")
 
     return downloaded
 
@@ -984,92 +1139,282 @@ async def extract_squarespace_api(page, base_url: str, content: dict):
 # Inner page discovery and scraping
 # ---------------------------------------------------------------------------
 
-def discover_inner_pages(soup: BeautifulSoup, base_url: str) -> list[str]:
-    """Find links to inner pages likely to have useful content."""
+# Link href/text keywords that suggest a page worth scraping
+_INNER_KW_RE = re.compile(
+    r"service|about|team|testimonial|review|meet|staff|doctor|contact", re.I,
+)
+
+
+def discover_inner_pages(html: str, base_url: str) -> list[str]:
+    """Find links to inner pages likely to have useful content.
+
+    Works on the raw lxml tree rather than BeautifulSoup -- only anchors are
+    needed, so the per-element wrapper objects are pure overhead here.
+    """
     inner_pages = []
-    keywords = [
-        "service", "about", "team", "testimonial", "review",
-        "meet", "staff", "doctor", "contact",
-    ]
+    seen = set()
     parsed_base = urlparse(base_url)
 
-    for link in soup.find_all("a", href=True):
-        href = link["href"]
-        text = clean_text(link.get_text()).lower()
-        for keyword in keywords:
-            if keyword in href.lower() or keyword in text:
-                full_url = urljoin(base_url, href)
-                parsed_link = urlparse(full_url)
-                if parsed_link.netloc == parsed_base.netloc and full_url not in inner_pages and full_url != base_url:
-                    inner_pages.append(full_url)
-                break
+    try:
+        tree = lxml.html.fromstring(html)
+    except (ParserError, ValueError):
+        return []
+
+    for link in tree.xpath("//a[@href]"):
+        href = link.get("href")
+        if not (_INNER_KW_RE.search(href) or _INNER_KW_RE.search(link.text_content())):
+            continue
+        full_url = urljoin(base_url, href)
+        parsed_link = urlparse(full_url)
+        if parsed_link.netloc == parsed_base.netloc and full_url not in seen and full_url != base_url:
+            seen.add(full_url)
+            inner_pages.append(full_url)
 
     return inner_pages[:5]
 
 
-async def scrape_inner_pages(page, inner_pages: list[str], content: dict, jsonld_all: list[dict]):
-    """Scrape inner pages to fill in missing content."""
-    if not inner_pages:
-        return
+# Inner pages are only mined for HTML and JSON-LD; these never affect that
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media", "stylesheet"})
+_TRACKER_RE = re.compile(
+    r"google-analytics\.com|googletagmanager\.com|doubleclick\.net|"
+    r"connect\.facebook\.net|hotjar\.com|clarity\.ms",
+    re.I,
+)
 
-    print_step(f"Scraping {len(inner_pages)} inner page(s) for additional content...")
 
-    for inner_url in inner_pages:
-        print(f"     {inner_url}")
-        try:
-            await page.goto(inner_url, wait_until="networkidle", timeout=30000)
-            await scroll_page(page)
-            await page.wait_for_timeout(1000)
+async def _block_heavy_resources(route):
+    """Abort requests the inner-page extractors never look at."""
+    request = route.request
+    if request.resource_type in _BLOCKED_RESOURCE_TYPES or _TRACKER_RE.search(request.url):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def _scrape_inner_page(context, inner_url: str) -> dict | None:
+    """Load one inner page in its own tab and run the extractors on it.
+
+    Returns the extracted fields, or None if the page could not be loaded or
+    an extractor failed on it.  Nothing is merged into the shared content
+    dict here, so several of these can run concurrently.
+    """
+    page = None
+    try:
+        page = await context.new_page()
+        await page.route("**/*", _block_heavy_resources)
+        await page.goto(inner_url, wait_until="networkidle", timeout=30000)
+        await scroll_page(page)
+        await page.wait_for_timeout(1000)
+        inner_html = await page.content()
+
+        inner_soup = BeautifulSoup(inner_html, "lxml")
+        collected = collect_elements(inner_soup)
+        inner_jsonld = extract_jsonld(inner_soup, collected)
+        return {
+            "services": extract_services(inner_soup, inner_jsonld, inner_url),
+            "testimonials": extract_testimonials(inner_soup, inner_jsonld),
+            "doctor": extract_doctor(inner_soup, inner_jsonld, inner_url),
+            "address": extract_address(inner_soup, inner_jsonld, inner_html),
+            "hours": extract_hours(inner_soup, inner_jsonld),
+            "images": collect_all_images(inner_soup, inner_url, collected),
+        }
+    except Exception as e:
+        print(f"     Warning: Could not scrape {inner_url}: {e}")
+        return None
+    finally:
+        if page is not None:
+            await page.close()
+
+
+def _inner_fields_satisfied(content: dict) -> dict[str, bool]:
+    """Report which inner-page targets the content already covers."""
+    return {
+        "doctor": bool(content["doctor"]["fullName"]),
+        "contact": bool(content["address"]["street"] and content["hours"] and content["phone"]),
+        "services": len(content["services"]) >= 5,
+        "testimonials": len(content["testimonials"]) >= 3,
+    }
+
 
-            inner_html = await page.content()
-            inner_soup = BeautifulSoup(inner_html, "lxml")
-            inner_jsonld = extract_jsonld(inner_soup)
+# Which target each inner-page URL keyword is expected to fill
+_INNER_KW_TARGETS = {
+    "service": "services",
+    "about": "doctor",
+    "team": "doctor",
+    "meet": "doctor",
+    "staff": "doctor",
+    "doctor": "doctor",
+    "testimonial": "testimonials",
+    "review": "testimonials",
+    "contact": "contact",
+}
+
+
+def _inner_page_needed(inner_url: str, satisfied: dict[str, bool]) -> bool:
+    """Whether an inner page could still contribute a missing field.
+
+    Pages picked up only by their link text (no keyword in the URL) are
+    always kept, since we can't tell from the URL what they hold.
+    """
+    path = urlparse(inner_url).path
+    targets = {_INNER_KW_TARGETS[m.group(0).lower()] for m in _INNER_KW_RE.finditer(path)}
+    return not targets or not all(satisfied[t] for t in targets)
+
+
+async def _merge_inner_pages(tasks: list[asyncio.Task], content: dict):
+    """Await inner-page scrapes and merge their fields in discovery order."""
+    # Dedup keys for everything merged so far, maintained across pages
+    existing_names = {s["name"].lower() for s in content["services"]}
+    existing_texts = {t["text"] for t in content["testimonials"]}
+    existing_urls = {img["url"] for img in content["images"] if isinstance(img, dict)}
+
+    try:
+        for n, task in enumerate(tasks):
+            result = await task
+            if result is None:
+                continue
 
             # Merge services
-            new_services = extract_services(inner_soup, inner_jsonld, inner_url)
-            existing_names = {s["name"].lower() for s in content["services"]}
-            for svc in new_services:
+            for svc in result["services"]:
                 if svc["name"].lower() not in existing_names:
                     content["services"].append(svc)
                     existing_names.add(svc["name"].lower())
 
             # Merge testimonials
-            new_testimonials = extract_testimonials(inner_soup, inner_jsonld)
-            existing_texts = {t["text"] for t in content["testimonials"]}
-            for t in new_testimonials:
+            for t in result["testimonials"]:
                 if t["text"] not in existing_texts:
                     content["testimonials"].append(t)
                     existing_texts.add(t["text"])
 
             # Doctor if not found yet
             if not content["doctor"]["fullName"]:
-                content["doctor"] = extract_doctor(inner_soup, inner_jsonld, inner_url)
+                content["doctor"] = result["doctor"]
 
             # Address if not found yet
             if not content["address"]["street"]:
-                content["address"] = extract_address(inner_soup, inner_jsonld, inner_html)
+                content["address"] = result["address"]
 
             # Hours if not found yet
             if not content["hours"]:
-                content["hours"] = extract_hours(inner_soup, inner_jsonld)
+                content["hours"] = result["hours"]
 
             # Collect additional images (list of dicts)
-            new_images = collect_all_images(inner_soup, inner_url)
-            existing_urls = {img["url"] for img in content["images"] if isinstance(img, dict)}
-            for img in new_images:
+            for img in result["images"]:
                 if img["url"] not in existing_urls:
                     content["images"].append(img)
                     existing_urls.add(img["url"])
 
-        except Exception as e:
-            print(f"     Warning: Could not scrape: {e}")
-            continue
+            if all(_inner_fields_satisfied(content).values()):
+                pending = tasks[n + 1:]
+                if pending:
+                    print_step(f"All target fields found; skipping {len(pending)} remaining page(s)")
+                break
+    finally:
+        # Whether we stopped early or a merge failed, no tab is left loading
+        pending = [task for task in tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def scrape_inner_pages(page, inner_pages: list[str], content: dict, jsonld_all: list[dict],
+                             prefetched: dict[str, asyncio.Task] | None = None):
+    """Scrape inner pages to fill in missing content.
+
+    Pages are loaded concurrently in separate tabs of the same browser
+    context, then merged into ``content`` in discovery order.  Pages whose
+    URL only targets fields the homepage already filled are skipped, and
+    once every target is filled the remaining loads are cancelled.
+
+    ``prefetched`` maps URLs to scrapes extract_content already started;
+    they are reused if still wanted and cancelled otherwise.
+    """
+    prefetched = prefetched or {}
+    satisfied = _inner_fields_satisfied(content)
+    if all(satisfied.values()):
+        inner_pages = []
+    else:
+        inner_pages = [u for u in inner_pages if _inner_page_needed(u, satisfied)]
+
+    unused = [task for u, task in prefetched.items() if u not in inner_pages]
+    for task in unused:
+        task.cancel()
+    await asyncio.gather(*unused, return_exceptions=True)
+
+    if not inner_pages:
+        return
+
+    print_step(f"Scraping {len(inner_pages)} inner page(s) for additional content...")
+    for inner_url in inner_pages:
+        print(f"     {inner_url}")
+
+    # Image URLs come from the rendered markup, not from loading the images,
+    # so inner-page tabs skip heavy resources (see _scrape_inner_page) and
+    # reach networkidle sooner.  The homepage tab keeps them: its
+    # background-image detection needs CSS.
+    tasks = [
+        prefetched.get(inner_url) or asyncio.create_task(_scrape_inner_page(page.context, inner_url))
+        for inner_url in inner_pages
+    ]
+    await _merge_inner_pages(tasks, content)
 
 
 # ---------------------------------------------------------------------------
 # Main extraction orchestrator
 # ---------------------------------------------------------------------------
 
+def extract_main_fields(content: dict, soup: BeautifulSoup, jsonld: list[dict], html: str, url: str,
+                        collected: dict):
+    """Run the homepage extractors and fill ``content`` in place.
+
+    Pure CPU work on an already-parsed page; extract_content runs it in a
+    worker thread so inner-page navigation can proceed meanwhile.
+    """
+    print_step("Extracting business name...")
+    if not content["businessName"]:
+        content["businessName"] = extract_business_name(soup, jsonld, url)
+    content["shortName"] = derive_short_name(content["businessName"])
+
+    print_step("Extracting tagline & description...")
+    if not content["tagline"]:
+        content["tagline"] = extract_tagline(soup)
+    if not content["description"]:
+        content["description"] = extract_description(soup, jsonld)
+
+    print_step("Extracting phone & email...")
+    content["phone"] = extract_phone(soup, jsonld, html, collected)
+    content["email"] = extract_email(soup, jsonld, html, collected)
+
+    print_step("Extracting address...")
+    if not content["address"]["street"]:
+        content["address"] = extract_address(soup, jsonld, html)
+
+    print_step("Extracting hours...")
+    content["hours"] = extract_hours(soup, jsonld)
+
+    print_step("Extracting social media links...")
+    content["socials"] = extract_social_links(soup, jsonld, collected)
+
+    print_step("Extracting logo URL...")
+    if not content["logoUrl"]:
+        content["logoUrl"] = extract_logo_url(soup, jsonld, url, collected)
+
+    print_step("Extracting hero image...")
+    content["heroImageUrl"] = extract_hero_image(soup, url, collected)
+
+    print_step("Extracting doctor/practitioner info...")
+    content["doctor"] = extract_doctor(soup, jsonld, url)
+
+    print_step("Extracting services...")
+    content["services"] = extract_services(soup, jsonld, url)
+
+    print_step("Extracting testimonials...")
+    content["testimonials"] = extract_testimonials(soup, jsonld)
+
+    print_step("Collecting images...")
+    content["images"] = collect_all_images(soup, url, collected)
+
+
 async def extract_content(url: str, output_dir: Path):
     """Main extraction function. Launches Playwright and scrapes the site."""
     content = empty_content()
@@ -1089,35 +1434,46 @@ async def extract_content(url: str, output_dir: Path):
         )
         page = await context.new_page()
 
-        # Navigate
-        print_step("Loading page (waiting for networkidle)...")
+        # Navigate.  Get the DOM first, then give the network a bounded chance
+        # to settle -- a slow tracker no longer costs a second full navigation.
+        print_step("Loading page...")
         try:
-            await page.goto(url, wait_until="networkidle", timeout=60000)
+            await page.goto(url, wait_until="domcontentloaded", timeout=15000)
         except Exception as e:
             print_step(f"Warning: Initial load issue: {e}")
-            print_step("Retrying with domcontentloaded...")
+            print_step("Retrying with a longer timeout...")
             try:
                 await page.goto(url, wait_until="domcontentloaded", timeout=60000)
-                await page.wait_for_timeout(5000)
             except Exception as e2:
                 print(f"  ERROR: Could not load page: {e2}")
                 await browser.close()
                 return content
+        try:
+            await page.wait_for_load_state("networkidle", timeout=30000)
+        except Exception:
+            print_step("Network did not go idle; continuing with what has loaded")
+
+        # Detect platform up front so lazy-content handling can branch on it
+        platform = detect_platform(await page.content(), url)
+        print_step(f"Detected platform: {platform}")
 
         # Scroll to trigger lazy-loaded content
         print_step("Scrolling to trigger lazy-loaded content...")
         await scroll_page(page)
+        if platform == "wix":
+            # Wix lazy images also need a jump to the very bottom
+            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+            await page.wait_for_timeout(2000)
+            await page.evaluate("window.scrollTo(0, 0)")
+            await page.wait_for_timeout(1000)
 
-        # Get rendered HTML
+        # Get rendered HTML (parsed once)
         html = await page.content()
         soup = BeautifulSoup(html, "lxml")
-
-        # Detect platform
-        platform = detect_platform(html, url)
-        print_step(f"Detected platform: {platform}")
+        collected = collect_elements(soup)
 
         # Parse JSON-LD
-        jsonld = extract_jsonld(soup)
+        jsonld = extract_jsonld(soup, collected)
         if jsonld:
             print_step(f"Found {len(jsonld)} JSON-LD block(s)")
 
@@ -1125,64 +1481,19 @@ async def extract_content(url: str, output_dir: Path):
         if platform == "squarespace":
             await extract_squarespace_api(page, url, content)
 
-        if platform == "wix":
-            # Re-scroll and re-parse for Wix lazy images
-            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            await page.wait_for_timeout(2000)
-            await page.evaluate("window.scrollTo(0, 0)")
-            await page.wait_for_timeout(1000)
-            html = await page.content()
-            soup = BeautifulSoup(html, "lxml")
-            jsonld = extract_jsonld(soup)
-
-        # Extract all fields
-        print_step("Extracting business name...")
-        if not content["businessName"]:
-            content["businessName"] = extract_business_name(soup, jsonld, url)
-        content["shortName"] = derive_short_name(content["businessName"])
-
-        print_step("Extracting tagline & description...")
-        if not content["tagline"]:
-            content["tagline"] = extract_tagline(soup)
-        if not content["description"]:
-            content["description"] = extract_description(soup, jsonld)
-
-        print_step("Extracting phone & email...")
-        content["phone"] = extract_phone(soup, jsonld, html)
-        content["email"] = extract_email(soup, jsonld, html)
-
-        print_step("Extracting address...")
-        if not content["address"]["street"]:
-            content["address"] = extract_address(soup, jsonld, html)
-
-        print_step("Extracting hours...")
-        content["hours"] = extract_hours(soup, jsonld)
-
-        print_step("Extracting social media links...")
-        content["socials"] = extract_social_links(soup, jsonld)
-
-        print_step("Extracting logo URL...")
-        if not content["logoUrl"]:
-            content["logoUrl"] = extract_logo_url(soup, jsonld, url)
-
-        print_step("Extracting hero image...")
-        content["heroImageUrl"] = extract_hero_image(soup, url)
-
-        print_step("Extracting doctor/practitioner info...")
-        content["doctor"] = extract_doctor(soup, jsonld, url)
-
-        print_step("Extracting services...")
-        content["services"] = extract_services(soup, jsonld, url)
-
-        print_step("Extracting testimonials...")
-        content["testimonials"] = extract_testimonials(soup, jsonld)
+        # Start loading the first inner page now so its navigation overlaps
+        # the homepage extraction, which runs off the event loop.
+        inner_pages = discover_inner_pages(html, url)
+        prefetched = {}
+        if inner_pages:
+            prefetched[inner_pages[0]] = asyncio.create_task(
+                _scrape_inner_page(context, inner_pages[0])
+            )
 
-        print_step("Collecting images...")
-        content["images"] = collect_all_images(soup, url)
+        await asyncio.to_thread(extract_main_fields, content, soup, jsonld, html, url, collected)
 
         # Scrape inner pages for additional content
-        inner_pages = discover_inner_pages(soup, url)
-        await scrape_inner_pages(page, inner_pages, content, jsonld)
+        await scrape_inner_pages(page, inner_pages, content, jsonld, prefetched)
 
         await browser.close()
 
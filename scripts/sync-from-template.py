@@ -16,11 +16,15 @@ Features:
 """
 
 import argparse
+import fnmatch
 import json
 import os
+import re
 import shutil
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
 
@@ -42,6 +46,17 @@ SAFETY_DIRS = {
     "public/guides",
 }
 
+# Non-source directories the audit never descends into
+AUDIT_SKIP_DIRS = frozenset({
+    "node_modules", "dist", ".git", ".planning", ".claude", ".bolt", "admin-backend",
+})
+
+# Read size for chunked file comparison
+COMPARE_CHUNK_SIZE = 64 * 1024
+
+# Parallel copies for Tier 1 sync
+COPY_WORKERS = 8
+
 
 def load_manifest() -> dict:
     with open(MANIFEST_PATH) as f:
@@ -78,11 +93,30 @@ def check_git_status(target: Path) -> bool:
 
 
 def files_are_identical(src: Path, dst: Path) -> bool:
-    """Check if two files have identical content."""
-    if not dst.exists():
+    """Check if two files have identical content.
+
+    Like rsync's quick check, equal size and mtime count as identical —
+    copy2 preserves mtime, so files synced on an earlier run match without
+    being read.  Otherwise contents are compared in chunks, stopping at the
+    first difference.
+    """
+    try:
+        src_stat = src.stat()
+        dst_stat = dst.stat()
+    except (OSError, IOError):
         return False
+    if src_stat.st_size != dst_stat.st_size:
+        return False
+    if src_stat.st_mtime_ns == dst_stat.st_mtime_ns:
+        return True
     try:
-        return src.read_bytes() == dst.read_bytes()
+        with open(src, "rb") as a, open(dst, "rb") as b:
+            while True:
+                chunk_a = a.read(COMPARE_CHUNK_SIZE)
+                if chunk_a != b.read(COMPARE_CHUNK_SIZE):
+                    return False
+                if not chunk_a:
+                    return True
     except (OSError, IOError):
         return False
 
@@ -117,21 +151,77 @@ def get_excluded_patterns(manifest: dict) -> list:
     return manifest.get("excluded", {}).get("patterns", [])
 
 
+@lru_cache(maxsize=None)
+def compile_exclude_patterns(patterns: tuple) -> tuple:
+    """Split exclusion patterns into set lookups plus one combined glob regex.
+
+    Returns (dir_names, nested_dirs, exact, glob_re):
+      - dir_names: single-segment "dir/" patterns, matched against any path segment
+      - nested_dirs: multi-segment "a/b/" patterns, matched as path substrings
+      - exact: plain paths, matched against the path or any trailing sub-path
+      - glob_re: every "*" pattern as one alternation, or None if there are none
+    """
+    dirs = [p for p in patterns if p.endswith("/")]
+    dir_names = frozenset(p.rstrip("/") for p in dirs if "/" not in p.rstrip("/"))
+    nested_dirs = tuple(p for p in dirs if "/" in p.rstrip("/"))
+    exact = frozenset(p for p in patterns if not p.endswith("/") and "*" not in p)
+    globs = [fnmatch.translate(p) for p in patterns if not p.endswith("/") and "*" in p]
+    glob_re = re.compile("|".join(globs)) if globs else None
+    return dir_names, nested_dirs, exact, glob_re
+
+
 def should_exclude(filepath: str, patterns: list) -> bool:
     """Check if a file matches any exclusion pattern."""
-    import fnmatch
-    for pattern in patterns:
-        if pattern.endswith("/"):
-            if filepath.startswith(pattern) or f"/{pattern}" in filepath:
-                return True
-        elif "*" in pattern:
-            if fnmatch.fnmatch(filepath, pattern) or fnmatch.fnmatch(os.path.basename(filepath), pattern):
-                return True
-        elif filepath == pattern or filepath.endswith(f"/{pattern}"):
+    dir_names, nested_dirs, exact, glob_re = compile_exclude_patterns(tuple(patterns))
+    parts = filepath.split("/")
+    if dir_names and not dir_names.isdisjoint(parts[:-1]):
+        return True
+    for pattern in nested_dirs:
+        if filepath.startswith(pattern) or f"/{pattern}" in filepath:
             return True
+    if exact:
+        # The path itself or any trailing sub-path ("a/b/c" -> "b/c", "c")
+        for i in range(len(parts)):
+            if "/".join(parts[i:]) in exact:
+                return True
+    if glob_re and (glob_re.match(filepath) or glob_re.match(parts[-1])):
+        return True
     return False
 
 
+def iter_template_files(template_dir: Path, excluded_patterns: list):
+    """Yield template-relative paths of all files, pruning excluded directories.
+
+    Uses os.scandir so file/dir checks come from the directory listing
+    rather than a stat per entry, and skips excluded directories before
+    descending into them.  Like os.walk, symlinked directories are listed
+    but not followed.
+    """
+    dir_patterns = [p.rstrip("/") for p in excluded_patterns if p.endswith("/")]
+    pruned_names = AUDIT_SKIP_DIRS | {d for d in dir_patterns if "/" not in d}
+    pruned_paths = frozenset(d for d in dir_patterns if "/" in d)
+
+    def _scan(path: str, rel: str):
+        with os.scandir(path) as entries:
+            for entry in entries:
+                rel_path = f"{rel}/{entry.name}" if rel else entry.name
+                if entry.is_dir():
+                    if entry.is_symlink() or entry.name in pruned_names or rel_path in pruned_paths:
+                        continue
+                    yield from _scan(entry.path, rel_path)
+                else:
+                    yield rel_path
+
+    yield from _scan(str(template_dir), "")
+
+
+def _copy_job(job: tuple) -> tuple:
+    src, dst, filepath, action = job
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copy2(src, dst)
+    return filepath, action
+
+
 def sync_files(template_dir: Path, target_dir: Path, manifest: dict, dry_run: bool):
     """Sync Tier 1 files from template to target."""
     shared_files = get_all_shared_files(manifest)
@@ -146,8 +236,10 @@ def sync_files(template_dir: Path, target_dir: Path, manifest: dict, dry_run: bo
     print(f"\n{'DRY RUN — ' if dry_run else ''}Syncing from {template_dir.name} → {target_dir.name}\n")
     print("=" * 70)
 
-    # Process shared (Tier 1) files
+    # Process shared (Tier 1) files.  Copies are queued and run on a thread
+    # pool afterwards; file I/O releases the GIL.
     print("\n📦 TIER 1 — SHARED FILES\n")
+    copy_jobs = []
     for filepath in sorted(shared_files):
         src = template_dir / filepath
         dst = target_dir / filepath
@@ -175,12 +267,15 @@ def sync_files(template_dir: Path, target_dir: Path, manifest: dict, dry_run: bo
         if dry_run:
             print(f"  {'📝' if action == 'UPDATE' else '✨'} Would {action}: {filepath}")
         else:
-            dst.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(src, dst)
-            print(f"  {'📝' if action == 'UPDATE' else '✨'} {action}: {filepath}")
+            copy_jobs.append((src, dst, filepath, action))
 
         synced += 1
 
+    if copy_jobs:
+        with ThreadPoolExecutor(max_workers=COPY_WORKERS) as pool:
+            for filepath, action in pool.map(_copy_job, copy_jobs):
+                print(f"  {'📝' if action == 'UPDATE' else '✨'} {action}: {filepath}")
+
     # Flag parameterized (Tier 2) files
     print("\n🔧 TIER 2 — PARAMETERIZED (manual review needed)\n")
     for filepath, reason in sorted(parameterized.items()):
@@ -226,46 +321,22 @@ def audit_files(template_dir: Path, manifest: dict):
     unclassified = []
     total_files = 0
 
-    for root, dirs, files in os.walk(template_dir):
-        # Skip excluded directories
-        rel_root = Path(root).relative_to(template_dir)
-        root_str = str(rel_root)
-
-        skip = False
-        for pattern in excluded_patterns:
-            if pattern.endswith("/"):
-                dirname = pattern.rstrip("/")
-                if root_str == dirname or root_str.startswith(dirname + "/"):
-                    skip = True
-                    break
-                if dirname in dirs:
-                    dirs.remove(dirname)
-        if skip:
+    for filepath in iter_template_files(template_dir, excluded_patterns):
+        # Skip binary/non-source files
+        if any(filepath.endswith(ext) for ext in [".webp", ".png", ".jpg", ".jpeg", ".gif", ".svg", ".ico", ".pdf", ".woff", ".woff2", ".ttf", ".eot"]):
             continue
 
-        # Also skip common non-source dirs
-        for skip_dir in ["node_modules", "dist", ".git", ".planning", ".claude", ".bolt", "admin-backend"]:
-            if skip_dir in dirs:
-                dirs.remove(skip_dir)
-
-        for filename in files:
-            filepath = str((Path(root) / filename).relative_to(template_dir))
-
-            # Skip binary/non-source files
-            if any(filepath.endswith(ext) for ext in [".webp", ".png", ".jpg", ".jpeg", ".gif", ".svg", ".ico", ".pdf", ".woff", ".woff2", ".ttf", ".eot"]):
-                continue
-
-            # Skip lock files
-            if filepath == "package-lock.json":
-                continue
+        # Skip lock files
+        if filepath == "package-lock.json":
+            continue
 
-            if should_exclude(filepath, excluded_patterns):
-                continue
+        if should_exclude(filepath, excluded_patterns):
+            continue
 
-            total_files += 1
+        total_files += 1
 
-            if filepath not in all_classified and not is_in_safety_dir(filepath):
-                unclassified.append(filepath)
+        if filepath not in all_classified and not is_in_safety_dir(filepath):
+            unclassified.append(filepath)
 
     if unclassified:
         print(f"\n⚠  {len(unclassified)} UNCLASSIFIED files found:\n")